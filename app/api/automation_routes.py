@@ -1,10 +1,10 @@
 """Automation API endpoints"""
 
-import asyncio
 import logging
+from functools import lru_cache
 from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Response
 from pydantic import BaseModel, Field
 
 from app.models.schemas import HealthResponse
@@ -12,14 +12,19 @@ from app.models.schemas import HealthResponse
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/automation", tags=["automation"])
 
-# Try to import automation service - use the actual service that exists
-try:
-    from app.services.automation_new import SequentialAutomationService
-    automation_service = SequentialAutomationService()
-except ImportError:
-    # Fallback if import fails
-    logger.warning("Could not import SequentialAutomationService - automation routes may not work")
-    automation_service = None
+# Status/health payloads are global (not per-user), so proxies may cache them briefly
+STATUS_CACHE_CONTROL = "public, max-age=5"
+
+
+@lru_cache(maxsize=1)
+def _svc():
+    """Resolve the shared automation service once (None if it cannot be imported)"""
+    try:
+        from app.services.automation_new import get_automation_service
+    except ImportError:
+        logger.warning("Could not import SequentialAutomationService - automation routes may not work")
+        return None
+    return get_automation_service()
 
 
 class AutomationStartRequest(BaseModel):
@@ -53,13 +58,16 @@ async def start_automation(
 ):
     """Start continuous automation (runs indefinitely until stopped)"""
     
+    automation_service = _svc()
+    
     if automation_service is None:
         raise HTTPException(
             status_code=503,
             detail="Automation service is not available"
         )
     
-    if automation_service.running:
+    # Reserve before scheduling - the background task only runs after the response
+    if not automation_service.reserve_start():
         raise HTTPException(
             status_code=400,
             detail="Automation is already running. Stop it first."
@@ -68,16 +76,22 @@ async def start_automation(
     logger.info(f"Starting automation for prefixes: {request.prefixes}")
     
     # Start automation in background - SequentialAutomationService uses start_sequential_processing
-    # Note: SequentialAutomationService doesn't support batch_size or specific prefixes in the same way
-    background_tasks.add_task(
-        automation_service.start_sequential_processing,
-        request.generation_interval
-    )
+    # Note: SequentialAutomationService picks prefixes from the database, not from the request
+    try:
+        background_tasks.add_task(
+            automation_service.start_sequential_processing,
+            request.generation_interval,
+            request.batch_size
+        )
+    except Exception:
+        automation_service.running = False
+        raise
     
     return {
         "message": "Automation started successfully",
         "prefixes": request.prefixes,
         "generation_interval": request.generation_interval,
+        "batch_size": request.batch_size,
         "note": "Sequential automation processes prefixes from database, not from request"
     }
 
@@ -89,13 +103,16 @@ async def run_automation(
 ):
     """Run automation for a specific duration"""
     
+    automation_service = _svc()
+    
     if automation_service is None:
         raise HTTPException(
             status_code=503,
             detail="Automation service is not available"
         )
     
-    if automation_service.running:
+    # Reserve before scheduling - the background task only runs after the response
+    if not automation_service.reserve_start():
         raise HTTPException(
             status_code=400,
             detail="Automation is already running. Stop it first."
@@ -105,10 +122,14 @@ async def run_automation(
     
     # SequentialAutomationService doesn't have run_for_duration, use start_sequential_processing
     # Duration control would need to be implemented separately
-    background_tasks.add_task(
-        automation_service.start_sequential_processing,
-        request.generation_interval
-    )
+    try:
+        background_tasks.add_task(
+            automation_service.start_sequential_processing,
+            request.generation_interval
+        )
+    except Exception:
+        automation_service.running = False
+        raise
     
     return {
         "message": f"Automation started (duration control not implemented for sequential service)",
@@ -123,6 +144,8 @@ async def run_automation(
 async def stop_automation():
     """Stop running automation"""
     
+    automation_service = _svc()
+    
     if automation_service is None:
         raise HTTPException(
             status_code=503,
@@ -144,9 +167,12 @@ async def stop_automation():
 
 
 @router.get("/status", response_model=AutomationStatsResponse)
-async def get_automation_status():
+async def get_automation_status(response: Response):
     """Get current automation status and statistics"""
     
+    response.headers["Cache-Control"] = STATUS_CACHE_CONTROL
+    automation_service = _svc()
+    
     if automation_service is None:
         return AutomationStatsResponse(
             running=False,
@@ -170,9 +196,12 @@ async def get_automation_status():
 
 
 @router.get("/health")
-async def automation_health():
+async def automation_health(response: Response):
     """Check automation service health"""
     
+    response.headers["Cache-Control"] = STATUS_CACHE_CONTROL
+    automation_service = _svc()
+    
     if automation_service is None:
         return {
             "status": "unavailable",
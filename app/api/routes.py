@@ -1,13 +1,18 @@
 """API route definitions"""
 
+import asyncio
 import logging
+import time
+import weakref
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Tuple
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
+import anyio
+from fastapi import APIRouter, HTTPException, Depends, Response
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 from app.core.database import health_check as db_health_check
 from app.models.schemas import (
     GenerateIDRequest, GenerateIDResponse, PrefixConfigResponse,
@@ -19,40 +24,104 @@ from app.services import IDGeneratorService, SPDCLScraperService, GoogleSheetsSe
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Health subcheck results, keyed by service: (expires_at, value)
+HEALTH_CHECK_TTL = 15
+_health_cache: Dict[str, Tuple[float, Any]] = {}
+_health_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
-# Dependency injection
+# Serial log events are queued by generate_id and inserted in batches by
+# serial_log_consumer (started from the app lifespan)
+SERIAL_LOG_BATCH_SIZE = 100
+SERIAL_LOG_FLUSH_INTERVAL = 0.2  # seconds
+serial_log_queue: "asyncio.Queue[dict]" = asyncio.Queue()
+
+# Serializes ID claims per prefix so concurrent generate calls for one prefix
+# don't race on the same prefix_metadata row; other prefixes are unaffected.
+# Weak values: a lock disappears once no request holds or waits on it, so
+# arbitrary path prefixes can't grow this without bound
+_generate_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _generate_lock(prefix: str) -> asyncio.Lock:
+    """The claim lock for a prefix, created on first use"""
+    lock = _generate_locks.get(prefix)
+    if lock is None:
+        lock = _generate_locks[prefix] = asyncio.Lock()
+    return lock
+
+
+# Dependency injection - one shared instance per process
+@lru_cache(maxsize=1)
 def get_id_generator() -> IDGeneratorService:
     return IDGeneratorService()
 
+@lru_cache(maxsize=1)
 def get_scraper() -> SPDCLScraperService:
     return SPDCLScraperService()
 
+@lru_cache(maxsize=1)
 def get_sheets() -> GoogleSheetsService:
     return GoogleSheetsService()
 
 
+@lru_cache(maxsize=1024)
+def _norm(prefix: str) -> str:
+    """Normalize a path prefix (strip + upper); prefixes are a small, repeating set"""
+    return prefix.strip().upper()
+
+
+async def _cached(key: str, ttl: float, fn: Callable[[], Any]) -> Any:
+    """Return the cached result of fn for key, re-running it once ttl seconds have passed"""
+    async with _health_locks[key]:
+        entry = _health_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        value = await anyio.to_thread.run_sync(fn)
+        _health_cache[key] = (time.monotonic() + ttl, value)
+        return value
+
+
+def _scraper_health() -> bool:
+    try:
+        return get_scraper().health_check()
+    except Exception:
+        return False
+
+
+def _sheets_health() -> bool:
+    try:
+        return get_sheets().health_check()
+    except Exception:
+        return False
+
+
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Comprehensive health check"""
+async def health_check(response: Response):
+    """Comprehensive health check (subchecks cached for HEALTH_CHECK_TTL seconds)"""
     
-    services = {}
+    response.headers["Cache-Control"] = "public, max-age=5"
     
-    # Check database
-    services["database"] = db_health_check()
+    checks = {
+        "database": db_health_check,
+        "scraper": _scraper_health,
+        "sheets": _sheets_health
+    }
+    results: Dict[str, bool] = {}
     
-    # Check scraper
-    try:
-        scraper = SPDCLScraperService()
-        services["scraper"] = scraper.health_check()
-    except Exception:
-        services["scraper"] = False
+    async def _run(name: str, fn: Callable[[], bool]):
+        try:
+            results[name] = (await _cached(name, HEALTH_CHECK_TTL, fn)) is True
+        except Exception:
+            results[name] = False
     
-    # Check Google Sheets
-    try:
-        sheets = GoogleSheetsService()
-        services["sheets"] = sheets.health_check()
-    except Exception:
-        services["sheets"] = False
+    # Run the checks concurrently in worker threads; the task group ties them to
+    # the request's cancel scope, so an abandoned probe doesn't leak its tasks
+    async with anyio.create_task_group() as tg:
+        for name, fn in checks.items():
+            tg.start_soon(_run, name, fn)
+    
+    services = {name: results.get(name, False) for name in checks}
     
     # Overall status
     overall_healthy = all(services.values())
@@ -67,24 +136,25 @@ async def health_check():
 async def generate_id(
     prefix: str,
     request: GenerateIDRequest,
-    background_tasks: BackgroundTasks,
     id_generator: IDGeneratorService = Depends(get_id_generator),
     scraper: SPDCLScraperService = Depends(get_scraper),
     sheets: GoogleSheetsService = Depends(get_sheets),
-    settings = Depends(get_settings)
+    settings: Settings = Depends(get_settings)
 ):
     """Generate next ID for a prefix with scraping and logging"""
     
-    prefix = prefix.strip().upper()
+    prefix = _norm(prefix)
     logger.info(f"Generating ID for prefix: {prefix}, dry_run: {request.dry_run}")
     
     try:
-        # Generate ID
-        id_result = id_generator.generate_next_id(
-            prefix=prefix,
-            digits=request.digits,
-            has_space=request.has_space
-        )
+        # Generate ID (blocking DB call off the event loop, one claim per prefix at a time)
+        async with _generate_lock(prefix):
+            id_result = await anyio.to_thread.run_sync(partial(
+                id_generator.generate_next_id,
+                prefix=prefix,
+                digits=request.digits,
+                has_space=request.has_space
+            ))
         
         mobile_number = None
         metadata = {}
@@ -94,7 +164,9 @@ async def generate_id(
         # Scraping (if not dry run)
         if not request.dry_run:
             try:
-                scrape_result = scraper.scrape_mobile_number(id_result.generated_id)
+                scrape_result = await anyio.to_thread.run_sync(
+                    scraper.scrape_mobile_number, id_result.generated_id
+                )
                 mobile_number = scrape_result.mobile_number
                 
                 metadata["scraper"] = {
@@ -117,13 +189,14 @@ async def generate_id(
         # Google Sheets logging (if not dry run)
         if not request.dry_run:
             try:
-                sheet_range = sheets.log_result(
+                sheet_range = await anyio.to_thread.run_sync(partial(
+                    sheets.log_result,
                     prefix=prefix,
                     serial_number=id_result.serial_number,
                     generated_id=id_result.generated_id,
                     mobile_number=mobile_number,
                     sheet_id=request.sheet_id
-                )
+                ))
                 metadata["sheets"] = {"range": sheet_range}
                 
             except Exception as e:
@@ -134,28 +207,24 @@ async def generate_id(
         else:
             metadata["sheets"] = {"skipped": "dry_run"}
         
-        # Background task: Log to serial_log table
+        # Queue serial_log entry (inserted in batches by serial_log_consumer)
         if not request.dry_run:
-            background_tasks.add_task(
-                log_serial_event,
-                id_generator,
-                prefix,
-                id_result.generated_id,
-                mobile_number,
-                status.value,
-                metadata
-            )
+            serial_log_queue.put_nowait({
+                "prefix": prefix,
+                "generated_id": id_result.generated_id,
+                "mobile_number": mobile_number,
+                "status": status.value,
+                "metadata": metadata
+            })
         
-        # Update prefix status
+        # Update prefix status (there is no error status - failed prefixes stay PENDING for retry)
         if status == OperationStatus.FAILED:
-            id_generator.update_prefix_status(
-                prefix, 
-                PrefixStatus.ERROR
+            await anyio.to_thread.run_sync(
+                id_generator.update_prefix_status, prefix, PrefixStatus.PENDING
             )
         elif mobile_number:
-            id_generator.update_prefix_status(
-                prefix, 
-                PrefixStatus.COMPLETED
+            await anyio.to_thread.run_sync(
+                id_generator.update_prefix_status, prefix, PrefixStatus.COMPLETED
             )
         
         return GenerateIDResponse(
@@ -171,12 +240,10 @@ async def generate_id(
     except Exception as e:
         logger.error(f"ID generation failed: {e}")
         
-        # Update prefix status to error
+        # Keep the prefix PENDING so it is retried
         try:
-            id_generator.update_prefix_status(
-                prefix, 
-                PrefixStatus.ERROR, 
-                str(e)
+            await anyio.to_thread.run_sync(
+                id_generator.update_prefix_status, prefix, PrefixStatus.PENDING
             )
         except Exception:
             pass  # Don't fail if status update fails
@@ -194,7 +261,7 @@ async def get_prefix_status(
 ):
     """Get current status of a prefix"""
     
-    prefix = prefix.strip().upper()
+    prefix = _norm(prefix)
     config = id_generator.get_prefix_status(prefix)
     
     if not config:
@@ -220,7 +287,7 @@ async def reset_prefix(
 ):
     """Reset a prefix to a specific starting number"""
     
-    prefix = prefix.strip().upper()
+    prefix = _norm(prefix)
     
     try:
         # Update the prefix configuration
@@ -237,39 +304,70 @@ async def reset_prefix(
             "status": PrefixStatus.PENDING.value
         }).eq("prefix", prefix).execute()
         
-        return {
-            "message": f"Prefix '{prefix}' reset to start from {starting_number + 1}",
-            "prefix": prefix,
-            "next_number": starting_number + 1
-        }
-        
     except Exception as e:
         logger.error(f"Prefix reset failed: {e}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to reset prefix: {str(e)}"
         )
+    
+    # Best-effort: let an idle automation loop pick the prefix up now. The reset
+    # is already saved, so a failure here must not turn it into a 500
+    try:
+        from app.services.automation_new import wake_running_automation
+        wake_running_automation()
+    except Exception as e:
+        logger.warning(f"Could not wake automation after reset: {e}")
+    
+    return {
+        "message": f"Prefix '{prefix}' reset to start from {starting_number + 1}",
+        "prefix": prefix,
+        "next_number": starting_number + 1
+    }
 
 
-async def log_serial_event(
-    id_generator: IDGeneratorService,
-    prefix: str,
-    generated_id: str,
-    mobile_number: Optional[str],
-    status: str,
-    metadata: dict
-):
-    """Background task to log serial event"""
+async def serial_log_consumer():
+    """Long-lived task that drains serial_log_queue and inserts events in batches
+    
+    A batch is flushed once SERIAL_LOG_BATCH_SIZE events are queued or
+    SERIAL_LOG_FLUSH_INTERVAL seconds after its first event, whichever is first.
+    """
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        events = [await serial_log_queue.get()]
+        deadline = loop.time() + SERIAL_LOG_FLUSH_INTERVAL
+        
+        try:
+            while len(events) < SERIAL_LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    events.append(await asyncio.wait_for(serial_log_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        finally:
+            # Also runs on cancellation so a partially collected batch is not lost
+            await _flush_serial_events(events)
+
+
+async def flush_serial_log_queue():
+    """Insert every event still waiting in serial_log_queue (used on shutdown)"""
+    events = []
+    while not serial_log_queue.empty():
+        events.append(serial_log_queue.get_nowait())
+    await _flush_serial_events(events)
+
+
+async def _flush_serial_events(events: list):
+    """Insert a batch of serial events, logging (not raising) on failure"""
+    if not events:
+        return
     try:
-        id_generator.log_serial_event(
-            prefix=prefix,
-            generated_id=generated_id,
-            mobile_number=mobile_number,
-            status=status,
-            metadata=metadata
-        )
+        await asyncio.to_thread(get_id_generator().log_serial_events_bulk, events)
     except Exception as e:
-        logger.error(f"Failed to log serial event: {e}")
+        logger.error(f"Failed to log {len(events)} serial events: {e}")
 
 
 # Note: Exception handlers are added at the app level in main.py
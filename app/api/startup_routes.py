@@ -1,16 +1,25 @@
 """Startup and database management API endpoints"""
 
+import asyncio
 import logging
-from typing import Dict, List
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 
+from app.models.enums import PrefixStatus
 from app.services.startup import StartupService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/startup", tags=["startup"])
 
+# Cached database summary: (expires_at, response)
+DATABASE_SUMMARY_TTL = 30
+_summary_cache: Optional[Tuple[float, "DatabaseSummaryResponse"]] = None
+_summary_lock = threading.Lock()
+
 
 class DatabaseSummaryResponse(BaseModel):
     """Database summary response"""
@@ -30,13 +39,27 @@ class ResumeResponse(BaseModel):
 
 
 @router.get("/database-summary", response_model=DatabaseSummaryResponse)
-async def get_database_summary():
-    """Get current database state summary"""
+def get_database_summary():
+    """Get current database state summary (cached for DATABASE_SUMMARY_TTL seconds)
     
-    startup_service = StartupService()
-    summary = startup_service.get_database_summary()
+    Sync handler: the Supabase query is blocking, so FastAPI runs it in its threadpool.
+    """
+    global _summary_cache
     
-    return DatabaseSummaryResponse(**summary)
+    with _summary_lock:
+        if _summary_cache is not None and _summary_cache[0] > time.monotonic():
+            return _summary_cache[1]
+        
+        startup_service = StartupService()
+        summary = DatabaseSummaryResponse(**startup_service.get_database_summary())
+        
+        _summary_cache = (time.monotonic() + DATABASE_SUMMARY_TTL, summary)
+        return summary
+
+
+def _invalidate_database_summary():
+    global _summary_cache
+    _summary_cache = None
 
 
 @router.post("/check-and-resume", response_model=ResumeResponse)
@@ -83,6 +106,9 @@ async def reset_completed_to_pending():
     
     try:
         reset_prefixes = await startup_service.mark_all_completed_as_pending()
+        _invalidate_database_summary()
+        if reset_prefixes:
+            startup_service.automation_service.wake()
         
         return {
             "message": f"Reset {len(reset_prefixes)} completed prefixes to pending",
@@ -98,28 +124,37 @@ async def reset_completed_to_pending():
 
 
 @router.post("/force-start-automation")
-async def force_start_automation(prefixes: List[str]):
+async def force_start_automation(prefixes: List[str], background_tasks: BackgroundTasks):
     """Force start automation for specific prefixes (regardless of status)"""
     
-    from app.services.automation_new import SequentialAutomationService as AutomationService
-    import asyncio
+    from app.services.automation_new import get_automation_service
+    
+    automation_service = get_automation_service()
+    
+    # Reserve before scheduling - the background task only runs after the response
+    if not automation_service.reserve_start():
+        raise HTTPException(
+            status_code=400,
+            detail="Automation is already running. Stop it first."
+        )
     
     try:
-        automation_service = AutomationService()
-        
-        if automation_service.running:
-            raise HTTPException(
-                status_code=400,
-                detail="Automation is already running. Stop it first."
+        # Sequential automation picks its work from the database - queue the
+        # requested prefixes by marking them PENDING
+        prefixes = [p.strip().upper() for p in prefixes]
+        if prefixes:
+            await asyncio.to_thread(
+                automation_service.client.table("prefix_metadata").update({
+                    "status": PrefixStatus.PENDING.value
+                }).in_("prefix", prefixes).execute
             )
+        _invalidate_database_summary()
         
-        # Start automation
-        asyncio.create_task(
-            automation_service.start_continuous_generation(
-                prefixes=prefixes,
-                generation_interval=5,
-                batch_size=1
-            )
+        # Start automation on the shared service, tied to the request lifecycle
+        background_tasks.add_task(
+            automation_service.start_sequential_processing,
+            5,  # generation_interval
+            1   # batch_size
         )
         
         return {
@@ -128,6 +163,7 @@ async def force_start_automation(prefixes: List[str]):
         }
         
     except Exception as e:
+        automation_service.running = False  # nothing was scheduled - release the reservation
         logger.error(f"Failed to force start automation: {e}")
         raise HTTPException(
             status_code=500,
@@ -1,72 +1,170 @@
 """Application configuration with robust validation"""
 
-from functools import lru_cache
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from dotenv import load_dotenv
 
+# https://<project-ref>.supabase.co, compiled once at import
+_SUPABASE_URL_RE = re.compile(r"^https://[A-Za-z0-9-]+\.supabase\.co/?$")
 
-class Settings(BaseSettings):
-    """Application settings with validation and defaults"""
+_TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+_FALSE_VALUES = {"0", "false", "f", "no", "n", "off"}
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Application settings with validation and defaults
+    
+    Plain dataclass filled from the environment by _load(); build it through
+    get_settings() rather than directly.
+    """
     
     # Database - Make optional during startup, validate at runtime
-    supabase_url: Optional[str] = Field(default=None, description="Supabase project URL")
-    supabase_anon_key: Optional[str] = Field(default=None, description="Supabase anonymous key")
+    supabase_url: Optional[str] = None
+    supabase_anon_key: Optional[str] = None
+    # Direct Postgres connection string (session mode) - enables LISTEN/NOTIFY change monitoring
+    database_url: Optional[str] = None
     
     # Google Sheets - Both optional, but at least one must be provided (checked at runtime)
-    google_service_account_file: Optional[str] = Field(
-        default=None,
-        description="Path to Google service account JSON file (optional if GOOGLE_SERVICE_ACCOUNT_JSON is set)"
-    )
-    google_service_account_json: Optional[str] = Field(
-        default=None,
-        description="Google service account JSON as string (for Railway/env vars)"
-    )
-    google_sheet_id: Optional[str] = Field(default=None, description="Google Sheet ID")
+    google_service_account_file: Optional[str] = None  # optional if GOOGLE_SERVICE_ACCOUNT_JSON is set
+    google_service_account_json: Optional[str] = None  # JSON as string (for Railway/env vars)
+    google_sheet_id: Optional[str] = None
     
     # Application settings
-    app_name: str = Field(default="SPDCL ID Generator", description="Application name")
-    app_version: str = Field(default="2.0.0", description="Application version")
-    debug: bool = Field(default=False, description="Debug mode")
+    app_name: str = "SPDCL ID Generator"
+    app_version: str = "2.0.0"
+    debug: bool = False
     
     # API settings
-    api_prefix: str = Field(default="/api/v1", description="API prefix")
-    cors_origins: list[str] = Field(default=["*"], description="CORS origins")
+    api_prefix: str = "/api/v1"
+    cors_origins: tuple[str, ...] = ("*",)  # immutable, shared default
     
     # ID Generation
-    default_digits: int = Field(default=5, ge=1, le=12, description="Default number of digits")
-    default_has_space: bool = Field(default=True, description="Default space between prefix and number")
+    default_digits: int = 5  # 1-12
+    default_has_space: bool = True
     
     # Scraping settings
-    scraper_enabled: bool = Field(default=True, description="Enable web scraping")
-    scraper_timeout: int = Field(default=30, ge=5, le=120, description="Scraper timeout in seconds")
-    scraper_max_retries: int = Field(default=3, ge=1, le=10, description="Maximum retry attempts")
-    scraper_retry_delay: float = Field(default=1.0, ge=0.1, le=10.0, description="Retry delay in seconds")
+    scraper_enabled: bool = True
+    scraper_timeout: int = 30  # seconds, 5-120
+    scraper_max_retries: int = 3  # 1-10
+    scraper_retry_delay: float = 1.0  # seconds, 0.1-10.0
+    scrape_concurrency: int = 4  # in-flight scrapes per automation batch, 1-32
+    
+    # Google Sheets logging - found rows are buffered and appended in one call
+    sheets_batch_size: int = 10  # rows per append, 1-500 (1 = append every row)
     
     # Rate limiting
-    rate_limit_enabled: bool = Field(default=True, description="Enable rate limiting")
-    rate_limit_requests: int = Field(default=100, ge=1, description="Requests per minute")
+    rate_limit_enabled: bool = True
+    rate_limit_requests: int = 100  # per minute
     
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        case_sensitive=False,
-        extra="ignore"
-    )
+    @cached_property
+    def service_account_info(self) -> Optional[dict]:
+        """Google service account credentials, resolved once on first use
+        
+        GOOGLE_SERVICE_ACCOUNT_JSON wins over google_service_account_file. The
+        file is only opened here (no existence check at settings load), so a
+        missing file raises FileNotFoundError at first use. None if neither is set.
+        """
+        if self.google_service_account_json:
+            return json.loads(self.google_service_account_json)
+        if self.google_service_account_file:
+            with open(self.google_service_account_file, encoding="utf-8") as f:
+                return json.load(f)
+        return None
+
+
+def _env(name: str) -> Optional[str]:
+    """Read an env var case-insensitively (SUPABASE_URL or supabase_url)"""
+    return os.environ.get(name.upper(), os.environ.get(name))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Parse a boolean env var (true/false, 1/0, yes/no, on/off)"""
+    raw = _env(name)
+    if raw is None:
+        return default
+    value = raw.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise ValueError(f"{name.upper()} must be a boolean, got {raw!r}")
+
+
+def _env_number(name: str, default, cast, ge=None, le=None):
+    """Parse a numeric env var with cast and check it against the ge/le bounds"""
+    raw = _env(name)
+    if raw is None:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(f"{name.upper()} must be a {cast.__name__}, got {raw!r}")
+    if (ge is not None and value < ge) or (le is not None and value > le):
+        raise ValueError(f"{name.upper()} must be between {ge} and {le}, got {value}")
+    return value
+
+
+def _env_list(name: str, default: tuple[str, ...]) -> tuple[str, ...]:
+    """Parse a list env var, either JSON (["a", "b"]) or comma-separated"""
+    raw = _env(name)
+    if raw is None:
+        return default
+    raw = raw.strip()
+    if raw.startswith("["):
+        return tuple(json.loads(raw))  # same JSON form pydantic-settings accepted
+    return tuple(item.strip() for item in raw.split(",") if item.strip())
+
+
+def _load() -> Settings:
+    """Build Settings from the environment (and .env, without overriding real env vars)"""
+    load_dotenv(".env", encoding="utf-8")
+    
+    supabase_url = _env("supabase_url")
+    if supabase_url is not None and not _SUPABASE_URL_RE.match(supabase_url):
+        raise ValueError("Invalid Supabase URL format")
     
-    @field_validator("supabase_url")
-    @classmethod
-    def validate_supabase_url(cls, v):
-        """Validate Supabase URL format"""
-        if v is None:
-            return v  # Allow None during startup
-        if not v.startswith("https://") or "supabase.co" not in v:
-            raise ValueError("Invalid Supabase URL format")
-        return v
-
-
-@lru_cache()
+    defaults = Settings()
+    return Settings(
+        supabase_url=supabase_url,
+        supabase_anon_key=_env("supabase_anon_key"),
+        database_url=_env("database_url"),
+        google_service_account_file=_env("google_service_account_file"),
+        google_service_account_json=_env("google_service_account_json"),
+        google_sheet_id=_env("google_sheet_id"),
+        app_name=_env("app_name") or defaults.app_name,
+        app_version=_env("app_version") or defaults.app_version,
+        debug=_env_bool("debug", defaults.debug),
+        api_prefix=_env("api_prefix") or defaults.api_prefix,
+        cors_origins=_env_list("cors_origins", defaults.cors_origins),
+        default_digits=_env_number("default_digits", defaults.default_digits, int, ge=1, le=12),
+        default_has_space=_env_bool("default_has_space", defaults.default_has_space),
+        scraper_enabled=_env_bool("scraper_enabled", defaults.scraper_enabled),
+        scraper_timeout=_env_number("scraper_timeout", defaults.scraper_timeout, int, ge=5, le=120),
+        scraper_max_retries=_env_number("scraper_max_retries", defaults.scraper_max_retries, int, ge=1, le=10),
+        scraper_retry_delay=_env_number("scraper_retry_delay", defaults.scraper_retry_delay, float, ge=0.1, le=10.0),
+        scrape_concurrency=_env_number("scrape_concurrency", defaults.scrape_concurrency, int, ge=1, le=32),
+        sheets_batch_size=_env_number("sheets_batch_size", defaults.sheets_batch_size, int, ge=1, le=500),
+        rate_limit_enabled=_env_bool("rate_limit_enabled", defaults.rate_limit_enabled),
+        rate_limit_requests=_env_number("rate_limit_requests", defaults.rate_limit_requests, int, ge=1),
+    )
+
+
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    """Get cached application settings"""
-    return Settings()
+    """Get cached application settings
+    
+    Always go through this (or Depends(get_settings)) instead of calling
+    Settings() directly, so the environment is parsed once per process.
+    """
+    global _settings
+    if _settings is None:
+        _settings = _load()  # a racing first call just builds an identical instance
+    return _settings
@@ -1,35 +1,58 @@
 """Database connection and client management"""
 
-from functools import lru_cache
-from typing import Optional
-
-from supabase import Client, create_client
+import atexit
+import threading
+from typing import TYPE_CHECKING, Optional
 
 from app.core.config import get_settings
 
-_client: Optional[Client] = None
+if TYPE_CHECKING:
+    from supabase import Client
+
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
 
 
-def get_supabase_client() -> Client:
-    """Get Supabase client with connection pooling"""
+def get_supabase_client() -> "Client":
+    """Get the process-wide Supabase client (created once, shared by all services)"""
     global _client
     
     if _client is None:
-        settings = get_settings()
-        _client = create_client(
-            supabase_url=settings.supabase_url,
-            supabase_key=settings.supabase_anon_key
-        )
+        # Services are also built from worker threads (health checks, threadpool
+        # handlers) - make sure only one client is ever created
+        with _client_lock:
+            if _client is None:
+                # Imported here so processes that never touch the DB don't load supabase
+                from supabase import create_client
+                
+                settings = get_settings()
+                _client = create_client(
+                    supabase_url=settings.supabase_url,
+                    supabase_key=settings.supabase_anon_key
+                )
+                # All table()/rpc() calls go through one pooled HTTP/2 httpx client
+                # (postgrest.session) - release its connections on interpreter exit
+                atexit.register(_close_client)
     
     return _client
 
 
+def _close_client():
+    """Close the pooled PostgREST connections of the shared client"""
+    if _client is not None and _client._postgrest is not None:
+        try:
+            _client._postgrest.session.close()
+        except Exception:
+            pass
+
+
 def health_check() -> bool:
     """Check database connection health"""
     try:
         client = get_supabase_client()
-        # Simple query to test connection
-        result = client.table("prefix_metadata").select("count", count="exact").limit(0).execute()
+        # Cheapest round-trip that proves connectivity: no exact COUNT(*) over the table
+        # (results are cached for HEALTH_CHECK_TTL by the /health route)
+        client.table("prefix_metadata").select("prefix").limit(1).execute()
         return True
     except Exception:
         return False
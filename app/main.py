@@ -1,53 +1,84 @@
 """FastAPI application entry point"""
 
+import asyncio
+import atexit
+import hashlib
+import importlib
 import logging
+import logging.config
+import logging.handlers
+import os
+import queue
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
 
-# Configure logging FIRST before any imports that might log
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configure logging FIRST before any imports that might log.
+# Loggers only enqueue records; one background QueueListener thread formats
+# and writes them, so request handlers and the automation loop never block
+# on stream I/O. "app" loggers don't propagate, so their records are handled
+# once even when uvicorn adds handlers higher up the chain.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream, respect_handler_level=True)
+_log_listener.start()
+# Flush whatever is still queued when the process exits
+atexit.register(_log_listener.stop)
+
+logging.config.dictConfig({
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "queue": {"()": logging.handlers.QueueHandler, "queue": _log_queue}
+    },
+    "loggers": {
+        "app": {"level": "INFO", "handlers": ["queue"], "propagate": False}
+    },
+    "root": {"level": "INFO", "handlers": ["queue"]}
+})
 
 logger = logging.getLogger(__name__)
 
+# Environment read once at import. Render sets PORT; without it we're in
+# build/test mode and background automation is skipped.
+SERVER_MODE = "PORT" in os.environ
+PORT = os.environ.get("PORT", "8000")
+RENDER_EXTERNAL_URL = os.environ.get("RENDER_EXTERNAL_URL") or os.environ.get("RENDER_SERVICE_URL")
+# Opt-in: start automation on the first API request instead of at boot
+AUTOMATION_LAZY_START = os.environ.get("AUTOMATION_LAZY_START", "").lower() in ("1", "true", "yes")
+# Seconds shutdown waits for the cancelled automation task to unwind
+SHUTDOWN_GRACE = float(os.environ.get("SHUTDOWN_GRACE", "10"))
+
 
 async def _keep_alive_service():
     """
     Keep-alive service to prevent Render free tier from shutting down the service.
-    Uses multiple strategies:
-    1. Internal ping every 5 minutes (may not count as external traffic)
-    2. If RENDER_EXTERNAL_URL is set, pings external URL (counts as external traffic)
+    If RENDER_EXTERNAL_URL (or RENDER_SERVICE_URL) is set, pings it every 5 minutes
+    (counts as external traffic). Without an external URL it does nothing - internal
+    localhost pings don't prevent shutdown.
     
     For best results on free tier, also set up external ping service (see KEEP_ALIVE_SETUP.md)
     """
-    import os
-    import asyncio
     import httpx
     
-    # Wait a bit before first ping to ensure server is fully started
-    await asyncio.sleep(30)
+    # External URL from environment (Render sets this)
+    external_url = RENDER_EXTERNAL_URL
     
-    # Try to get external URL from environment (Render sets this)
-    external_url = os.getenv("RENDER_EXTERNAL_URL") or os.getenv("RENDER_SERVICE_URL")
+    if not external_url:
+        logger.info("💓 Keep-alive disabled - set RENDER_EXTERNAL_URL to enable it (see KEEP_ALIVE_SETUP.md)")
+        return
     
-    # Get the port and construct URLs
-    port = os.getenv("PORT", "8000")
-    local_url = f"http://localhost:{port}/"
+    # Wait a bit before first ping to ensure server is fully started
+    await asyncio.sleep(30)
     
-    # Use external URL if available, otherwise use localhost
-    health_url = external_url if external_url else local_url
+    local_url = f"http://localhost:{PORT}/"
+    health_url = external_url
     
-    if external_url:
-        logger.info(f"💓 Keep-alive service initialized (will ping EXTERNAL URL {health_url} every 5 minutes)")
-        logger.info("✅ Using external URL - this counts as external traffic and prevents shutdown!")
-    else:
-        logger.info(f"💓 Keep-alive service initialized (will ping {health_url} every 5 minutes)")
-        logger.warning("⚠️  No external URL found - internal pings may not prevent shutdown")
-        logger.info("📖 See KEEP_ALIVE_SETUP.md for setting up external ping service (FREE)")
+    logger.info("💓 Keep-alive service initialized (will ping EXTERNAL URL %s every 5 minutes)", health_url)
+    logger.info("✅ Using external URL - this counts as external traffic and prevents shutdown!")
     
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    # One request every 5 minutes - a single pooled connection is plenty
+    limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+    async with httpx.AsyncClient(timeout=10.0, limits=limits, http2=False) as client:
         ping_count = 0
         while True:
             try:
@@ -59,17 +90,17 @@ async def _keep_alive_service():
                 try:
                     response = await client.get(health_url, follow_redirects=True)
                     if response.status_code == 200:
-                        logger.info(f"💓 Keep-alive ping #{ping_count} successful - service remains active")
+                        logger.debug("💓 Keep-alive ping #%d successful - service remains active", ping_count)
                     else:
-                        logger.warning(f"💓 Keep-alive ping #{ping_count} returned status {response.status_code}")
+                        logger.warning("💓 Keep-alive ping #%d returned status %d", ping_count, response.status_code)
                 except Exception as e:
-                    logger.warning(f"💓 Keep-alive ping #{ping_count} failed: {e} (service may still be running)")
+                    logger.warning("💓 Keep-alive ping #%d failed: %s (service may still be running)", ping_count, e)
                     # If external URL fails, try localhost as fallback
-                    if external_url and ping_count % 3 == 0:  # Every 3rd failed ping, try localhost
+                    if ping_count % 3 == 0:  # Every 3rd failed ping, try localhost
                         try:
                             response = await client.get(local_url, timeout=5.0)
                             if response.status_code == 200:
-                                logger.info(f"💓 Fallback localhost ping successful")
+                                logger.info("💓 Fallback localhost ping successful")
                         except:
                             pass
                     
@@ -77,178 +108,306 @@ async def _keep_alive_service():
                 logger.info("💓 Keep-alive service cancelled")
                 break
             except Exception as e:
-                logger.error(f"💓 Keep-alive service error: {e}")
+                logger.error("💓 Keep-alive service error: %s", e)
                 # Continue running even if there's an error
                 await asyncio.sleep(60)  # Wait 1 minute before retrying
 
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import httpx
+from fastapi.responses import ORJSONResponse
 
-# Import with error handling to prevent crashes during module load
-try:
-    from app.core.config import get_settings
-except Exception as e:
-    logger.error(f"Failed to import settings: {e}")
-    get_settings = None
+# "/" always returns the same body - serialize it once at import
+_HEALTH_BYTES = orjson.dumps({
+    "status": "live",
+    "service": "SPDCL ID Generator",
+    "version": "2.0.0"
+})
+_HEALTH_ETAG = f'"{hashlib.md5(_HEALTH_BYTES).hexdigest()}"'
+# Starlette doesn't mutate a Response while sending it, so both are shared across requests
+_HEALTH_RESPONSE = Response(content=_HEALTH_BYTES, media_type="application/json", headers={"ETag": _HEALTH_ETAG})
+_HEALTH_NOT_MODIFIED = Response(status_code=304, headers={"ETag": _HEALTH_ETAG})
 
-try:
-    from app.api.routes import router
-except Exception as e:
-    logger.error(f"Failed to import routes: {e}")
-    router = None
 
-try:
-    from app.api.automation_routes import router as automation_router
-except Exception as e:
-    logger.error(f"Failed to import automation_routes: {e}")
-    automation_router = None
+def _try_import(path: str, attr: str = "router"):
+    """Import attr from module path, or log and return None (prevents crashes during module load)"""
+    try:
+        return getattr(importlib.import_module(path), attr)
+    except Exception as e:
+        logger.error("Failed to import %s.%s: %s", path, attr, e)
+        return None
 
-try:
-    from app.api.startup_routes import router as startup_router
-except Exception as e:
-    logger.error(f"Failed to import startup_routes: {e}")
-    startup_router = None
 
-try:
-    from app.models.schemas import ErrorResponse
-except Exception as e:
-    logger.error(f"Failed to import ErrorResponse: {e}")
-    ErrorResponse = None
+get_settings = _try_import("app.core.config", "get_settings")
 
+# Routers are mounted by _register_routers, in this order
+ROUTER_MODULES = ("app.api.routes", "app.api.automation_routes", "app.api.startup_routes")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan events - starts automation in background thread"""
-    import os
-    import threading
-    import asyncio
-    import time
-    
-    # Define automation function BEFORE yield (but don't start it yet)
-    def run_automation():
-        """Run automation in background thread - completely non-blocking"""
+
+def _error(detail) -> dict:
+    """Error response body (same shape as schemas.ErrorResponse)"""
+    return {"error": detail, "detail": None, "request_id": None}
+
+
+async def _wait_for_port(port: int, timeout: float = 5.0) -> bool:
+    """Wait until something accepts connections on localhost:port, for at most timeout seconds"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
         try:
-            # Wait to ensure web server is fully started and port is bound
-            logger.info("⏳ Waiting 10 seconds for web server to fully bind to port...")
-            time.sleep(10)
-            
-            logger.info("🔄 Starting background automation...")
-            
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Start automation
-            async def start():
-                try:
-                    from app.services.startup import StartupService
-                    from app.services.db_change_monitor import DatabaseChangeMonitor
-                    
-                    startup = StartupService()
-                    app.state.startup_service = startup
-                    automation_service = startup.automation_service
-                    
-                    logger.info("📊 Checking database for prefixes to automate...")
-                    resume_summary = await startup.check_and_resume_automation()
-                    
-                    # Start automation FIRST (before monitor)
-                    if resume_summary['total_prefixes_to_automate'] > 0:
-                        logger.info(f"✅ Starting automation for {resume_summary['total_prefixes_to_automate']} prefixes")
-                        await automation_service.start_sequential_processing(generation_interval=5)
-                    else:
-                        logger.info("ℹ️  No prefixes to automate - monitoring for changes...")
-                    
-                    # Start database change monitor AFTER automation check (monitor will handle restarts)
-                    change_monitor = DatabaseChangeMonitor(automation_service, check_interval=30)
-                    app.state.change_monitor = change_monitor
-                    
-                    # Start monitoring in background
-                    monitor_task = asyncio.create_task(change_monitor.start_monitoring())
-                    logger.info("🔍 Database change monitor started (will detect Supabase changes)")
-                    
-                    # Start keep-alive service to prevent Render free tier shutdown
-                    # Note: Render free tier shuts down after 15 minutes of inactivity
-                    # This service pings the health endpoint every 5 minutes to keep it active
-                    # For best results, also set up external ping service (see KEEP_ALIVE_SETUP.md)
-                    keep_alive_task = asyncio.create_task(_keep_alive_service())
-                    logger.info("💓 Keep-alive service started (pings health endpoint every 5 minutes)")
-                    
-                    # Keep running - change monitor will restart automation when changes detected
-                    if resume_summary['total_prefixes_to_automate'] == 0:
-                        while True:
-                            await asyncio.sleep(300)  # Check every 5 minutes as backup
-                            if not automation_service.running:
-                                resume_summary = await startup.check_and_resume_automation()
-                                if resume_summary['total_prefixes_to_automate'] > 0:
-                                    logger.info(f"✅ Found {resume_summary['total_prefixes_to_automate']} prefixes - starting automation")
-                                    await automation_service.start_sequential_processing(generation_interval=5)
-                except Exception as e:
-                    logger.error(f"❌ Automation error: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            loop.run_until_complete(start())
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout=0.1)
+            writer.close()
+            return True
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(0.2)
+    return False
+
+
+async def _await_processing(startup):
+    """Wait for the processing loop check_and_resume_automation scheduled (if any)"""
+    task = startup.automation_task
+    if task is not None and not task.done():
+        await task
+
+
+async def _automation_driver(startup, automation_service, prefixes_available):
+    """Sleep until the change monitor reports new work, then resume automation"""
+    while True:
+        await prefixes_available.wait()
+        prefixes_available.clear()
+        if automation_service.running:
+            automation_service.wake()  # the running loop picks up new PENDING prefixes itself
+            continue
+        try:
+            resume_summary = await startup.check_and_resume_automation()
+            if resume_summary['total_prefixes_to_automate'] > 0:
+                logger.info("✅ Found %s prefixes - starting automation", resume_summary['total_prefixes_to_automate'])
+                await _await_processing(startup)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"❌ Failed to start automation thread: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            # Stay alive - an error here must not tear down the monitor's task group
+            logger.error("❌ Automation resume error: %s", e)
+
+
+# Held open for the life of the process once this worker owns automation
+AUTOMATION_LOCK_PATH = "/tmp/spdcl-automation.lock"
+_automation_lock_fd = None
+
+
+def _acquire_automation_lock() -> bool:
+    """Take the cross-worker automation lock, so only one uvicorn worker runs automation"""
+    global _automation_lock_fd
+    try:
+        import fcntl
+    except ImportError:
+        return True  # no flock (Windows dev box) - single worker assumed
+    
+    fd = os.open(AUTOMATION_LOCK_PATH, os.O_CREAT | os.O_RDWR, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    _automation_lock_fd = fd  # released by the OS when the process exits
+    return True
+
+
+async def _run_automation(app: FastAPI, port: int):
+    """Run background automation on the server's event loop (blocking work is offloaded to threads)"""
+    if _automation_lock_fd is None and not _acquire_automation_lock():
+        logger.info("ℹ️  Another worker owns automation - this worker only serves the API")
+        return
     
-    # Start automation thread BEFORE yield (non-blocking, daemon thread)
-    # This schedules it to start, but doesn't block server startup
     try:
-        port = os.getenv("PORT")
-        if port is None:
+        # Wait until the web server has bound its port (capped, so a missed probe can't stall automation)
+        logger.info("⏳ Waiting for web server to bind to port %s...", port)
+        if await _wait_for_port(port):
+            logger.info("✅ Web server is accepting connections")
+        else:
+            logger.warning("⚠️  Port not reachable after 5s - starting automation anyway")
+        
+        logger.info("🔄 Starting background automation...")
+        
+        from app.services.startup import StartupService
+        from app.services.db_change_monitor import DatabaseChangeMonitor
+        
+        startup = StartupService()
+        app.state.startup_service = startup
+        automation_service = startup.automation_service
+        app.state.automation_started.set()
+        
+        logger.info("📊 Checking database for prefixes to automate...")
+        resume_summary = await startup.check_and_resume_automation()
+        
+        # Run automation FIRST (before monitor)
+        if resume_summary['total_prefixes_to_automate'] > 0:
+            logger.info("✅ Starting automation for %s prefixes", resume_summary['total_prefixes_to_automate'])
+            await _await_processing(startup)
+        else:
+            logger.info("ℹ️  No prefixes to automate - monitoring for changes...")
+        
+        # Start database change monitor AFTER automation check - it sets
+        # prefixes_available when new PENDING work shows up
+        app.state.prefixes_available = asyncio.Event()
+        change_monitor = DatabaseChangeMonitor(
+            automation_service,
+            check_interval=30,
+            changes_event=app.state.prefixes_available
+        )
+        app.state.change_monitor = change_monitor
+        
+        # Monitor, keep-alive and the resume driver live in one task group:
+        # cancelling the automation task (on shutdown) cancels all of them.
+        # Keep-alive prevents Render free tier shutdown after 15 minutes of
+        # inactivity (for best results, also set up an external ping service -
+        # see KEEP_ALIVE_SETUP.md)
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(change_monitor.start_monitoring(), name="change-monitor")
+            logger.info("🔍 Database change monitor started (will detect Supabase changes)")
+            tg.create_task(_keep_alive_service(), name="keep-alive")
+            logger.info("💓 Keep-alive service started (pings health endpoint every 5 minutes)")
+            tg.create_task(
+                _automation_driver(startup, automation_service, app.state.prefixes_available),
+                name="automation-driver"
+            )
+    except asyncio.CancelledError:
+        logger.info("🛑 Background automation cancelled")
+        raise
+    except Exception as e:
+        logger.exception("❌ Automation error: %s", e)
+
+
+def _start_automation(app: FastAPI):
+    """Schedule _run_automation on the running loop (at most once)"""
+    app.state.automation_pending = False
+    app.state.automation_task = asyncio.create_task(_run_automation(app, int(PORT)), name="automation")
+
+
+@asynccontextmanager
+async def _automation_lifespan(app: FastAPI):
+    """Schedule background automation for the app's lifetime; on exit stop it and await the task"""
+    # Set once automation services are up - API handlers can await it
+    app.state.automation_started = asyncio.Event()
+    app.state.automation_pending = False
+    
+    # Schedule automation on this event loop BEFORE yield (non-blocking)
+    # _run_automation waits for the port itself, so server startup is never delayed
+    try:
+        if not SERVER_MODE:
             logger.info("ℹ️  Running in build/test mode - skipping automation startup")
+        elif AUTOMATION_LAZY_START:
+            app.state.automation_pending = True
+            logger.info("💤 AUTOMATION_LAZY_START set - automation will start on the first API request")
         else:
             logger.info("🔧 Server mode detected - scheduling background automation...")
-            automation_thread = threading.Thread(target=run_automation, daemon=True, name="AutomationThread")
-            automation_thread.start()
-            logger.info("✅ Background automation thread started (will begin in 10 seconds)")
+            _start_automation(app)
+            logger.info("✅ Background automation task scheduled (will begin once the port is bound)")
     except Exception as e:
-        logger.warning(f"⚠️  Could not start automation thread (web server will continue): {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.warning("⚠️  Could not schedule automation (web server will continue): %s", e)
+        logger.debug("Automation scheduling traceback", exc_info=True)
+    
+    try:
+        yield
+    finally:
+        if hasattr(app.state, 'change_monitor'):
+            try:
+                app.state.change_monitor.stop()
+                logger.info("✅ Change monitor stopped")
+            except Exception as e:
+                logger.warning("⚠️  Error stopping change monitor: %s", e)
+        if hasattr(app.state, 'startup_service'):
+            try:
+                app.state.startup_service.automation_service.stop()
+                logger.info("✅ Automation service stopped")
+            except Exception as e:
+                logger.warning("⚠️  Error stopping automation: %s", e)
+        # Cancels the whole automation task group (monitor, keep-alive, driver)
+        automation_task = getattr(app.state, "automation_task", None)
+        if automation_task is not None:
+            automation_task.cancel()
+            # Bounded, so a stuck thread can't hold up a redeploy; cancelled work
+            # (e.g. the buffered Sheets flush) gets this long to finish
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(automation_task, return_exceptions=True), SHUTDOWN_GRACE
+                )
+                logger.info("✅ Background tasks cancelled")
+            except asyncio.TimeoutError:
+                logger.warning("⚠️  Automation did not stop within %ss", SHUTDOWN_GRACE)
+        app.state.automation_task = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events - starts automation as a background task
     
-    # CRITICAL: Yield NOW - this allows the web server to start immediately
-    # Render will detect this and mark the service as "live"
-    logger.info("🚀 FastAPI web server starting - binding to port...")
-    yield
+    This is the app's only startup/shutdown hook. Routers must not carry their
+    own on_startup/on_shutdown handlers or lifespans - add that work here.
+    """
+    # Debug mode adds per-callback bookkeeping; keep it off unless a developer asked for it
+    if not os.environ.get("PYTHONASYNCIODEBUG"):
+        asyncio.get_running_loop().set_debug(False)
     
-    # Cleanup on shutdown (after yield completes)
-    logger.info("🛑 Shutting down application...")
-    if hasattr(app.state, 'change_monitor'):
+    async with _automation_lifespan(app):
+        # Batched serial_log writer for the generate endpoint
+        serial_log_task = None
         try:
-            app.state.change_monitor.stop()
-            logger.info("✅ Change monitor stopped")
+            from app.api.routes import serial_log_consumer
+            serial_log_task = asyncio.create_task(serial_log_consumer(), name="serial-log-writer")
         except Exception as e:
-            logger.warning(f"⚠️  Error stopping change monitor: {e}")
-    if hasattr(app.state, 'startup_service'):
+            logger.warning("⚠️  Could not start serial log writer: %s", e)
+        
+        # CRITICAL: Yield NOW - this allows the web server to start immediately
+        # Render will detect this and mark the service as "live"
+        logger.info("🚀 FastAPI web server starting - binding to port...")
+        yield
+        
+        # Cleanup on shutdown (after yield completes)
+        logger.info("🛑 Shutting down application...")
+        if serial_log_task:
+            serial_log_task.cancel()
+            await asyncio.gather(serial_log_task, return_exceptions=True)
+            try:
+                from app.api.routes import flush_serial_log_queue
+                await flush_serial_log_queue()
+                logger.info("✅ Serial log queue flushed")
+            except Exception as e:
+                logger.warning("⚠️  Error flushing serial log queue: %s", e)
+
+
+def _register_routers(app: FastAPI, api_prefix: str):
+    """Import and mount the API routers (kept out of module import so DB/service modules load lazily)"""
+    routes_registered = 0
+    
+    for path in ROUTER_MODULES:
+        router = _try_import(path)
+        if router is None:
+            continue
         try:
-            app.state.startup_service.automation_service.stop()
-            logger.info("✅ Automation service stopped")
+            app.include_router(router, prefix=api_prefix)
+            routes_registered += 1
+            logger.info("✅ Routes from %s registered at %s", path, api_prefix)
         except Exception as e:
-            logger.warning(f"⚠️  Error stopping automation: {e}")
+            logger.warning("⚠️  Could not register routes from %s: %s", path, e)
+    
+    logger.info("✅ Total routes registered: %s/%s", routes_registered, len(ROUTER_MODULES))
 
 
 def create_app() -> FastAPI:
     """Create FastAPI application"""
-    import os
-    
     # Log port binding info for Render
-    port = os.getenv("PORT", "8000")
-    logger.info("=" * 60)
-    logger.info(f"Creating FastAPI app")
-    logger.info(f"Will bind to: 0.0.0.0:{port}")
-    logger.info("=" * 60)
+    logger.debug("=" * 60)
+    logger.debug("Creating FastAPI app")
+    logger.info("Will bind to: 0.0.0.0:%s", PORT)
+    logger.debug("=" * 60)
     
     # Get settings with error handling
     app_name = "SPDCL ID Generator"
     app_version = "2.0.0"
     api_prefix = "/api/v1"
-    cors_origins = ["*"]
+    cors_origins = ("*",)
     
     try:
         if get_settings:
@@ -256,118 +415,108 @@ def create_app() -> FastAPI:
             app_name = settings.app_name or app_name
             app_version = settings.app_version or app_version
             api_prefix = settings.api_prefix or api_prefix
-            cors_origins = settings.cors_origins or cors_origins
+            cors_origins = settings.cors_origins  # empty (CORS_ORIGINS="") disables CORS
     except Exception as e:
-        logger.warning(f"⚠️  Could not load all settings (using defaults): {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        logger.warning("⚠️  Could not load all settings (using defaults): %s", e)
+        logger.debug("Settings load traceback", exc_info=True)
     
     app = FastAPI(
         title=app_name,
         version=app_version,
         description="Robust SPDCL ID Generator with scraping and Google Sheets integration",
-        lifespan=lifespan
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse
     )
     
-    logger.info("✅ FastAPI app created - ready to start server")
-    
-    # CORS middleware
-    try:
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=cors_origins,
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-    except Exception as e:
-        logger.warning(f"⚠️  Could not add CORS middleware: {e}")
+    logger.debug("✅ FastAPI app created - ready to start server")
     
-    # Include API routes (only if they imported successfully)
-    routes_registered = 0
-    if router:
-        try:
-            app.include_router(router, prefix=api_prefix)
-            routes_registered += 1
-            logger.info(f"✅ Main routes registered at {api_prefix}")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not register main routes: {e}")
-    
-    if automation_router:
+    # CORS middleware - only when origins are configured (backend-to-backend callers don't need it).
+    # A literal ["*"] takes Starlette's allow-all branch; otherwise a frozenset makes its
+    # per-request `origin in allow_origins` check O(1)
+    if not cors_origins:
+        logger.info("ℹ️  No CORS origins configured - CORS middleware not installed")
+    else:
+        if "*" in cors_origins:
+            allow_origins = ["*"]
+        else:
+            allow_origins = frozenset(cors_origins)
+            app.state.cors_origins = allow_origins
         try:
-            app.include_router(automation_router, prefix=api_prefix)
-            routes_registered += 1
-            logger.info(f"✅ Automation routes registered at {api_prefix}")
+            app.add_middleware(
+                CORSMiddleware,
+                allow_origins=allow_origins,
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            )
         except Exception as e:
-            logger.warning(f"⚠️  Could not register automation routes: {e}")
+            logger.warning("⚠️  Could not add CORS middleware: %s", e)
     
-    if startup_router:
-        try:
-            app.include_router(startup_router, prefix=api_prefix)
-            routes_registered += 1
-            logger.info(f"✅ Startup routes registered at {api_prefix}")
-        except Exception as e:
-            logger.warning(f"⚠️  Could not register startup routes: {e}")
+    _register_routers(app, api_prefix)
     
-    logger.info(f"✅ Total routes registered: {routes_registered}/3")
+    if AUTOMATION_LAZY_START:
+        @app.middleware("http")
+        async def start_automation_on_first_request(request: Request, call_next):
+            """Kick off deferred automation on the first non-health request"""
+            # Check-and-clear has no await in between, so only one request can start it
+            if app.state.automation_pending and request.url.path not in ("/", "/health"):
+                logger.info("🔄 First API request (%s) - starting deferred automation", request.url.path)
+                _start_automation(app)
+            return await call_next(request)
     
     # Health check endpoint (for Render free tier - keeps service alive)
     @app.get("/")
-    async def health_check():
+    async def health_check(request: Request):
         """Health check endpoint - keeps service alive on Render free tier"""
-        # Ultra-simple response - no imports, no settings access, instant response
-        return {
-            "status": "live",
-            "service": "SPDCL ID Generator",
-            "version": "2.0.0"
-        }
+        # Ultra-simple response - prebuilt Response objects, nothing allocated per request.
+        # No Cache-Control: keep-alive pings must keep reaching the app.
+        if request.headers.get("if-none-match") == _HEALTH_ETAG:
+            return _HEALTH_NOT_MODIFIED
+        return _HEALTH_RESPONSE
+    
+    # Serialized /health body, rebuilt only when the automation stats snapshot
+    # changes (the service swaps in a new snapshot dict on every update)
+    health_body = {"stats": None, "bytes": None}
+    no_stats = {}  # shared, so the pre-automation body is also serialized only once
     
     @app.get("/health")
     async def detailed_health():
         """Detailed health check with automation stats"""
-        try:
-            settings = get_settings()
-            service_name = settings.app_name
-            service_version = settings.app_version
-        except:
-            service_name = "SPDCL ID Generator"
-            service_version = "2.0.0"
+        stats = no_stats
+        # Automation stats if available (startup_service is set once automation starts)
+        startup_service = getattr(app.state, "startup_service", None)
+        if startup_service is not None:
+            try:
+                stats = startup_service.automation_service.get_stats()
+            except Exception as e:
+                logger.warning("⚠️  Could not read automation stats: %s", e)
         
-        stats = {}
-        try:
-            # Try to get automation stats if available
-            if hasattr(app.state, 'startup_service'):
-                stats = app.state.startup_service.automation_service.get_stats()
-        except:
-            pass
-        return {
-            "status": "running",
-            "service": service_name,
-            "version": service_version,
-            "automation": {
-                "running": stats.get("current_prefix") is not None,
-                "generated": stats.get("total_generated", 0),
-                "found": stats.get("mobile_numbers_found", 0)
-            }
-        }
+        if health_body["bytes"] is None or stats is not health_body["stats"]:
+            health_body["bytes"] = orjson.dumps({
+                "status": "running",
+                # Name/version resolved once in create_app - static for the process
+                "service": app_name,
+                "version": app_version,
+                "automation": {
+                    "running": stats.get("current_prefix") is not None,
+                    "generated": stats.get("total_generated", 0),
+                    "found": stats.get("mobile_numbers_found", 0)
+                }
+            })
+            health_body["stats"] = stats
+        return Response(
+            content=health_body["bytes"],
+            media_type="application/json",
+            headers={"Cache-Control": "public, max-age=5"}
+        )
     
-    # Exception handlers (only if ErrorResponse imported successfully)
-    if ErrorResponse:
-        @app.exception_handler(HTTPException)
-        async def http_exception_handler(request, exc):
-            return JSONResponse(
-                status_code=exc.status_code,
-                content=ErrorResponse(
-                    error=exc.detail
-                ).dict()
-            )
-    else:
-        @app.exception_handler(HTTPException)
-        async def http_exception_handler(request, exc):
-            return JSONResponse(
-                status_code=exc.status_code,
-                content={"error": exc.detail}
-            )
+    # Exception handlers
+    @app.exception_handler(HTTPException)
+    async def http_exception_handler(request, exc):
+        return ORJSONResponse(
+            status_code=exc.status_code,
+            content=_error(exc.detail)
+        )
     
     return app
 
@@ -377,20 +526,20 @@ try:
     app = create_app()
     logger.info("✅ App instance created successfully")
 except Exception as e:
-    logger.error(f"❌ CRITICAL: Failed to create app: {e}")
-    import traceback
-    logger.error(traceback.format_exc())
+    logger.exception("❌ CRITICAL: Failed to create app: %s", e)
     # Create minimal app that will at least start
-    import os
-    app = FastAPI(title="SPDCL ID Generator", version="2.0.0")
+    app = FastAPI(title="SPDCL ID Generator", version="2.0.0", default_response_class=ORJSONResponse)
+    
+    # Built once: the failure and port don't change (and `e` is unbound after this block)
+    _degraded_body = {
+        "status": "degraded",
+        "message": "App started but some services failed to initialize",
+        "error": str(e),
+        "port": PORT
+    }
     
     @app.get("/")
     async def minimal_health():
-        return {
-            "status": "degraded",
-            "message": "App started but some services failed to initialize",
-            "error": str(e),
-            "port": os.getenv("PORT", "8000")
-        }
+        return _degraded_body
     
     logger.warning("⚠️  Created minimal app - some features may not work")
\ No newline at end of file
@@ -1,16 +1,16 @@
 """Application enums"""
 
-from enum import Enum
+from enum import StrEnum
 
 
-class PrefixStatus(str, Enum):
+class PrefixStatus(StrEnum):
     """Status of a prefix configuration - Only 3 statuses"""
     NOT_STARTED = "not_started"
     PENDING = "pending"
     COMPLETED = "completed"
 
 
-class OperationStatus(str, Enum):
+class OperationStatus(StrEnum):
     """Status of an operation"""
     SUCCESS = "success"
     FAILED = "failed"
@@ -18,7 +18,7 @@ class OperationStatus(str, Enum):
     TIMEOUT = "timeout"
 
 
-class LogLevel(str, Enum):
+class LogLevel(StrEnum):
     """Log levels"""
     DEBUG = "debug"
     INFO = "info"
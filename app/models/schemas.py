@@ -1,9 +1,9 @@
 """Pydantic schemas for data validation"""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 
 from .enums import PrefixStatus, OperationStatus
 
@@ -11,10 +11,10 @@ from .enums import PrefixStatus, OperationStatus
 # Request Models
 class GenerateIDRequest(BaseModel):
     """Request to generate next ID for a prefix"""
-    digits: Optional[int] = Field(default=None, ge=1, le=12, description="Number of digits")
-    has_space: Optional[bool] = Field(default=None, description="Include space between prefix and number")
+    digits: int | None = Field(default=None, ge=1, le=12, description="Number of digits")
+    has_space: bool | None = Field(default=None, description="Include space between prefix and number")
     dry_run: bool = Field(default=False, description="Skip scraping and sheets logging")
-    sheet_id: Optional[str] = Field(default=None, description="Override Google Sheet ID")
+    sheet_id: str | None = Field(default=None, description="Override Google Sheet ID")
 
 
 class PrefixConfigRequest(BaseModel):
@@ -39,61 +39,57 @@ class GenerateIDResponse(BaseModel):
     generated_id: str
     prefix: str
     serial_number: int
-    mobile_number: Optional[str] = None
+    mobile_number: str | None = None
     status: OperationStatus
-    sheet_range: Optional[str] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    sheet_range: str | None = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
 
 class ScrapeResult(BaseModel):
     """Result from web scraping"""
-    mobile_number: Optional[str] = None
+    mobile_number: str | None = None
     success: bool
     attempts: int
-    error_message: Optional[str] = None
+    error_message: str | None = None
     response_time: float
-    raw_data: Optional[Dict[str, Any]] = None
+    raw_data: dict[str, Any] | None = None
 
 
 class HealthResponse(BaseModel):
     """Health check response"""
     status: str = "healthy"
     version: str = "2.0.0"
-    services: Dict[str, bool] = Field(default_factory=dict)
+    services: dict[str, bool] = Field(default_factory=dict)
 
 
 class ErrorResponse(BaseModel):
     """Error response"""
     error: str
-    detail: Optional[str] = None
-    request_id: Optional[str] = None
+    detail: str | None = None
+    request_id: str | None = None
 
 
 # Internal Models
 class PrefixConfig(BaseModel):
     """Internal prefix configuration model"""
-    prefix: str
+    # Strip/upper-case and the non-empty check run in pydantic-core, not a Python validator
+    model_config = ConfigDict(frozen=True, str_strip_whitespace=True, str_to_upper=True)
+
+    prefix: str = Field(min_length=1)
     digits: int
     last_number: int
     has_space: bool
     status: PrefixStatus
 
-    @validator('prefix')
-    def validate_prefix(cls, v):
-        """Validate prefix format"""
-        if not v or not v.strip():
-            raise ValueError("Prefix cannot be empty")
-        return v.strip().upper()
-
 
 class SerialLogEntry(BaseModel):
     """Serial number log entry"""
     id: str
     prefix: str
     generated_id: str
-    mobile_number: Optional[str]
+    mobile_number: str | None
     status: OperationStatus
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: dict[str, Any] | None = None
 
 
 class IDGenerationResult(BaseModel):
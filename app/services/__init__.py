@@ -1,5 +1,24 @@
 """Business logic services"""
 
-from .id_generator import IDGeneratorService
-from .scraper import SPDCLScraperService  
-from .sheets import GoogleSheetsService
+import importlib
+
+# Resolved on first attribute access (PEP 562), so importing one service module
+# doesn't pull in gspread/requests/Supabase for the others
+_LAZY = {
+    "IDGeneratorService": "app.services.id_generator",
+    "SPDCLScraperService": "app.services.scraper",
+    "GoogleSheetsService": "app.services.sheets",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    """Import the service class on first use"""
+    try:
+        module_path = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
@@ -1,11 +1,15 @@
 """Sequential automation service - processes one prefix at a time"""
 
 import asyncio
-import gc
 import logging
-import traceback
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from postgrest.exceptions import APIError
 
 from app.core.config import get_settings
 from app.core.database import get_supabase_client
@@ -16,6 +20,35 @@ from app.models.enums import PrefixStatus, OperationStatus
 
 logger = logging.getLogger(__name__)
 
+# A partial Sheets batch is appended at most this long (seconds) after its first row was buffered
+SHEETS_FLUSH_INTERVAL = 10.0
+# With nothing to process, re-query prefix_metadata this often (seconds) unless woken by wake()
+IDLE_POLL_INTERVAL = 30.0
+# Postgres error code for a missing column (prefix_metadata.priority before sql/add_prefix_priority.sql)
+UNDEFINED_COLUMN = "42703"
+# PostgREST / Postgres error codes for a missing RPC (claim_next_prefix before sql/claim_next_prefix.sql)
+UNDEFINED_FUNCTION = ("PGRST202", "42883")
+
+
+@dataclass(slots=True)
+class _Stats:
+    """Mutable automation counters, updated in place by the processing loop"""
+    total_generated: int = 0
+    mobile_numbers_found: int = 0
+    errors: int = 0
+    start_time: Optional[datetime] = None
+    current_prefix: Optional[str] = None
+    
+    def as_dict(self) -> Dict:
+        """Plain-dict copy for the published snapshot"""
+        return {
+            "total_generated": self.total_generated,
+            "mobile_numbers_found": self.mobile_numbers_found,
+            "errors": self.errors,
+            "start_time": self.start_time,
+            "current_prefix": self.current_prefix
+        }
+
 
 class SequentialAutomationService:
     """Service for sequential automated processing - ONE prefix at a time"""
@@ -26,29 +59,49 @@ class SequentialAutomationService:
         self.id_generator = IDGeneratorService()
         self.scraper = SPDCLScraperService()
         self.sheets = GoogleSheetsService()
+        # Scrapes get their own bounded pool, so slow scraper calls can't starve the
+        # Supabase/Sheets calls (and the change monitor) in the default executor
+        self._scrape_executor = ThreadPoolExecutor(
+            max_workers=self.settings.scrape_concurrency, thread_name_prefix="scraper"
+        )
         self.running = False
         self.current_prefix = None
-        self.stats = {
-            "total_generated": 0,
-            "mobile_numbers_found": 0,
-            "errors": 0,
-            "start_time": None,
-            "current_prefix": None
-        }
+        # Set by wake() to cut an idle wait short when new work may exist
+        self._wake = asyncio.Event()
+        self.stats = _Stats()
+        # Read-only copy of stats served to HTTP handlers; replaced wholesale
+        # (a single reference swap) by _publish_stats, never mutated in place
+        self._stats_snapshot: Dict = {}
+        self._start_monotonic: Optional[float] = None
+        # Cleared if prefix_metadata has no priority column (sql/add_prefix_priority.sql)
+        self._order_by_priority = True
+        # Cleared after the first claim_next_prefix RPC failure (sql/claim_next_prefix.sql not applied)
+        self._claim_rpc_available = True
+        self._publish_stats()
+        # Found (serial_number, generated_id, mobile_number) rows waiting for one Sheets append
+        self._sheets_buffer: List[Tuple[int, str, str]] = []
+        self._sheets_buffer_prefix: Optional[str] = None
+        # Armed by the first buffered row; flushes a partial batch SHEETS_FLUSH_INTERVAL later
+        self._sheets_flush_timer: Optional[asyncio.TimerHandle] = None
+        # Latest background append; each one waits for the previous, so rows land in order
+        self._sheets_append_task: Optional[asyncio.Task] = None
     
     async def start_sequential_processing(
         self, 
-        generation_interval: int = 5  # seconds between generations
+        generation_interval: int = 5,  # seconds between generations
+        batch_size: int = 1  # IDs generated per iteration
     ):
         """Start sequential processing - ONE prefix at a time based on database status"""
         
         self.running = True
-        self.stats["start_time"] = datetime.now(timezone.utc)
+        self.stats.start_time = datetime.now(timezone.utc)
+        self._start_monotonic = time.monotonic()  # runtime clock - no tz-aware datetime per update
+        self._publish_stats()
         
         logger.info("Starting SEQUENTIAL prefix processing")
         logger.info("Rule: Process ONE prefix at a time until completion")
         logger.info("Rule: Complete PENDING first, then NOT_STARTED")
-        logger.info(f"Generation interval: {generation_interval}s")
+        logger.info("Generation interval: %ss, batch size: %s", generation_interval, batch_size)
         logger.info("Max IDs: Calculated from digit count (4 digits = 0000-9999, 5 digits = 00000-99999, etc.)")
         
         try:
@@ -56,103 +109,163 @@ class SequentialAutomationService:
             while self.running:
                 iteration_count += 1
                 try:
+                    # Clear before querying, so a wake() during the query isn't lost
+                    self._wake.clear()
                     # Get the next prefix to process
-                    logger.debug(f"🔄 Automation loop iteration #{iteration_count} - checking for prefixes...")
+                    logger.debug("🔄 Automation loop iteration #%s - checking for prefixes...", iteration_count)
                     current_prefix = await self._get_next_prefix_to_process()
                     
                     if current_prefix:
                         self.current_prefix = current_prefix
-                        self.stats["current_prefix"] = current_prefix
+                        self.stats.current_prefix = current_prefix
+                        self._publish_stats()
                         
-                        logger.info(f"🎯 Processing prefix: {current_prefix}")
+                        logger.info("🎯 Processing prefix: %s", current_prefix)
                         
                         # Process this prefix until completion
                         await self._process_prefix_until_completion(
                             current_prefix, 
-                            generation_interval
+                            generation_interval,
+                            batch_size
                         )
                         
                         # After processing, clear current prefix and continue loop
-                        logger.info(f"✅ Finished processing prefix: {current_prefix}")
+                        logger.info("✅ Finished processing prefix: %s", current_prefix)
                         logger.info("🔄 Looking for next prefix to process...")
                         self.current_prefix = None
-                        self.stats["current_prefix"] = None
+                        self.stats.current_prefix = None
+                        self._publish_stats()
                         
                     else:
                         logger.info("⏸️  No prefixes to process, waiting...")
-                        await asyncio.sleep(generation_interval)
+                        self._publish_stats()
+                        await self._idle_wait(max(generation_interval, IDLE_POLL_INTERVAL))
                         
                 except Exception as e:
                     # Handle individual iteration errors - don't stop the whole service
-                    logger.error(f"Error in automation loop iteration: {e}")
-                    logger.error(traceback.format_exc())
+                    logger.exception("Error in automation loop iteration: %s", e)
                     # Wait before retrying
                     await asyncio.sleep(generation_interval)
                     # Continue running - don't break the loop
                     
         except Exception as e:
             # Only log fatal errors - don't raise to keep service running
-            logger.error(f"Fatal error in sequential processing: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("Fatal error in sequential processing: %s", e)
             self.running = False
             # Don't raise - let the service stop gracefully and be restarted
         finally:
             self.current_prefix = None
-            self.stats["current_prefix"] = None
+            self.stats.current_prefix = None
+            self._publish_stats()
             logger.info("Sequential processing loop ended")
     
+    async def _idle_wait(self, timeout: float):
+        """Sleep until wake() is called or timeout seconds pass"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    def wake(self):
+        """Re-check for work now instead of at the next idle poll"""
+        self._wake.set()
+    
+    def reserve_start(self) -> bool:
+        """Mark the service running before its loop is scheduled (False if it already is)
+        
+        Check and set happen with no await in between, so two start requests racing
+        on the shared service can't both schedule a processing loop.
+        """
+        if self.running:
+            return False
+        self.running = True
+        return True
+    
     async def _get_next_prefix_to_process(self) -> Optional[str]:
         """Get the next prefix to process - PENDING first, then NOT_STARTED only when all PENDING are done"""
         
+        # Blocking Supabase queries - run in a worker thread, off the event loop
+        return await asyncio.to_thread(self._select_next_prefix)
+    
+    def _select_next_prefix(self) -> Optional[str]:
+        """Synchronous body of _get_next_prefix_to_process"""
+        
         try:
             # PRIORITY 1: Process PENDING prefixes first (complete all pending work)
-            pending_result = self.client.table("prefix_metadata").select("prefix").eq("status", PrefixStatus.PENDING.value).limit(1).execute()
+            prefix = self._first_prefix_with_status(PrefixStatus.PENDING)
             
-            if pending_result.data:
-                prefix = pending_result.data[0]["prefix"]
-                logger.info(f"✅ Found PENDING prefix to process: {prefix}")
+            if prefix:
+                logger.info("✅ Found PENDING prefix to process: %s", prefix)
                 return prefix
             
             # PRIORITY 2: Only if NO PENDING prefixes exist, start NOT_STARTED prefixes
-            # Check if there are any PENDING at all
-            all_pending = self.client.table("prefix_metadata").select("prefix").eq("status", PrefixStatus.PENDING.value).execute()
-            
-            if len(all_pending.data) == 0:
-                # All PENDING are completed, now start NOT_STARTED
-                not_started_result = self.client.table("prefix_metadata").select("prefix").eq("status", PrefixStatus.NOT_STARTED.value).limit(1).execute()
-                
-                if not_started_result.data:
-                    prefix = not_started_result.data[0]["prefix"]
-                    logger.info(f"✅ All PENDING completed - Starting NOT_STARTED prefix: {prefix}")
-                    
-                    # Mark it as PENDING when we start processing
-                    self.client.table("prefix_metadata").update({
-                        "status": PrefixStatus.PENDING.value
-                    }).eq("prefix", prefix).execute()
-                    
-                    logger.info(f"✅ Changed {prefix} status: NOT_STARTED → PENDING (now processing)")
-                    return prefix
-            else:
-                logger.debug(f"⏳ Still have {len(all_pending.data)} PENDING prefixes - waiting to complete them first")
+            # (the empty limit(1) lookup above already proves there are none - no separate count query)
+            prefix = self._claim_next_not_started()
+            if prefix:
+                logger.info("✅ All PENDING completed - Starting NOT_STARTED prefix: %s", prefix)
+                logger.info("✅ Changed %s status: NOT_STARTED → PENDING (now processing)", prefix)
+                return prefix
             
             # No prefixes to process
             return None
             
         except Exception as e:
-            logger.error(f"Error getting next prefix: {e}")
+            logger.error("Error getting next prefix: %s", e)
             return None
     
+    def _claim_next_not_started(self) -> Optional[str]:
+        """Mark one NOT_STARTED prefix PENDING and return it (None if there are none)"""
+        
+        if self._claim_rpc_available:
+            try:
+                # Atomic select-and-update (sql/claim_next_prefix.sql) - one round-trip, no race
+                result = self.client.rpc("claim_next_prefix", {}).execute()
+                return result.data[0]["prefix"] if result.data else None
+            except APIError as e:
+                if e.code not in UNDEFINED_FUNCTION:
+                    raise
+                # Stop asking for it - otherwise every idle poll and wake repeats this warning
+                logger.warning("claim_next_prefix RPC not found, using SELECT+UPDATE fallback from now on")
+                self._claim_rpc_available = False
+        
+        prefix = self._first_prefix_with_status(PrefixStatus.NOT_STARTED)
+        if not prefix:
+            return None
+        
+        self.client.table("prefix_metadata").update({
+            "status": PrefixStatus.PENDING.value
+        }).eq("prefix", prefix).execute()
+        return prefix
+    
+    def _first_prefix_with_status(self, status: PrefixStatus) -> Optional[str]:
+        """Highest-priority prefix with this status (None if there are none)"""
+        
+        if self._order_by_priority:
+            try:
+                result = self.client.table("prefix_metadata").select("prefix").eq("status", status.value).order("priority", desc=True).order("prefix").limit(1).execute()
+                return result.data[0]["prefix"] if result.data else None
+            except APIError as e:
+                if e.code != UNDEFINED_COLUMN:
+                    raise
+                # The priority column hasn't been added yet - stop asking for it
+                logger.warning("prefix_metadata has no priority column, picking prefixes in any order")
+                self._order_by_priority = False
+        
+        result = self.client.table("prefix_metadata").select("prefix").eq("status", status.value).limit(1).execute()
+        return result.data[0]["prefix"] if result.data else None
+    
     async def _process_prefix_until_completion(
         self, 
         prefix: str, 
-        generation_interval: int
+        generation_interval: int,
+        batch_size: int = 1
     ):
         """Process a single prefix until completion (reaches max for digit count)"""
         
         # Get prefix config to determine max number based on digits
-        prefix_config = self.id_generator.get_prefix_status(prefix)
+        prefix_config = await asyncio.to_thread(self.id_generator.get_prefix_status, prefix)
         if not prefix_config:
-            logger.error(f"Prefix {prefix} not found in database")
+            logger.error("Prefix %s not found in database", prefix)
             return
         
         digits = prefix_config.digits
@@ -161,146 +274,246 @@ class SequentialAutomationService:
         
         consecutive_errors = 0
         max_consecutive_errors = 10
+        # Generations start at most once per generation_interval; time spent
+        # generating/scraping counts towards the interval instead of adding to it
+        next_send_at = time.monotonic()
         
-        logger.info(f"Starting processing for prefix: {prefix}")
-        logger.info(f"  Digits: {digits} (range: 0 to {max_number})")
-        logger.info(f"  Current: {current_number}, Remaining: {max_number - current_number}")
+        logger.info("Starting processing for prefix: %s", prefix)
+        logger.info("  Digits: %s (range: 0 to %s)", digits, max_number)
+        logger.info("  Current: %s, Remaining: %s", current_number, max_number - current_number)
         
         try:
             while self.running and current_number < max_number:
                 try:
-                    # Check current number before generating
-                    prefix_config = self.id_generator.get_prefix_status(prefix)
-                    if not prefix_config:
-                        break
-                    
-                    current_number = prefix_config.last_number
+                    # Pace generations (see next_send_at) - stop() may land while waiting
+                    delay = next_send_at - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        if not self.running:
+                            break
                     
-                    # Check if we've reached the maximum
-                    if current_number >= max_number:
-                        logger.info(f"Reached maximum for {prefix}: {current_number}/{max_number}")
-                        break
+                    next_send_at = time.monotonic() + generation_interval
                     
-                    # Generate and process one ID
-                    success = await self._generate_and_process_single_id(prefix)
+                    # Generate and process one ID, or a batch (never past max_number)
+                    count = min(batch_size, max_number - current_number)
+                    if count > 1:
+                        last_serial = await self._generate_and_process_batch(prefix, count)
+                    else:
+                        last_serial = await self._generate_and_process_single_id(prefix)
                     
-                    if success:
+                    if last_serial is not None:
                         consecutive_errors = 0
-                        # Update current number after generation
-                        prefix_config = self.id_generator.get_prefix_status(prefix)
-                        if prefix_config:
-                            current_number = prefix_config.last_number
-                            remaining = max_number - current_number
-                            logger.info(f"Progress: {current_number}/{max_number} (remaining: {remaining})")
-                        
-                        # Periodic memory cleanup for free tier (every 50 IDs)
-                        if current_number % 50 == 0:
-                            gc.collect()
-                            logger.debug("Memory cleanup performed")
+                        # The atomic claim returned the new last_number - no re-read needed
+                        current_number = last_serial
+                        remaining = max_number - current_number
+                        logger.info("Progress: %s/%s (remaining: %s)", current_number, max_number, remaining)
                     else:
                         consecutive_errors += 1
-                        logger.warning(f"Error count: {consecutive_errors}/{max_consecutive_errors}")
+                        logger.warning("Error count: %s/%s", consecutive_errors, max_consecutive_errors)
+                        current_number = await self._resync_last_number(prefix, current_number)
                     
                     # Check if too many consecutive errors
                     if consecutive_errors >= max_consecutive_errors:
-                        logger.error(f"Too many consecutive errors for {prefix}, keeping as PENDING")
+                        logger.error("Too many consecutive errors for %s, keeping as PENDING", prefix)
                         # Keep as PENDING so it can be retried later
                         break
                     
-                    # Wait before next generation
-                    await asyncio.sleep(generation_interval)
-                    
                 except Exception as e:
-                    logger.error(f"❌ Error processing {prefix}: {e}")
+                    logger.error("❌ Error processing %s: %s", prefix, e)
                     consecutive_errors += 1
+                    current_number = await self._resync_last_number(prefix, current_number)
                     
                     if consecutive_errors >= max_consecutive_errors:
                         # Keep as PENDING so it can be retried later
-                        logger.warning(f"Too many errors for {prefix}, keeping as PENDING for retry")
+                        logger.warning("Too many errors for %s, keeping as PENDING for retry", prefix)
                         break
                     
                     await asyncio.sleep(generation_interval)
             
             # Check final status and mark as completed if reached max
-            final_config = self.id_generator.get_prefix_status(prefix)
+            final_config = await asyncio.to_thread(self.id_generator.get_prefix_status, prefix)
             if final_config:
                 if final_config.last_number >= max_number:
-                    logger.info(f"✅ Completed prefix {prefix} - reached maximum: {final_config.last_number}/{max_number}")
+                    logger.info("✅ Completed prefix %s - reached maximum: %s/%s", prefix, final_config.last_number, max_number)
                     await self._mark_prefix_status(prefix, PrefixStatus.COMPLETED)
-                    logger.info(f"📊 Prefix {prefix} marked as COMPLETED")
+                    logger.info("📊 Prefix %s marked as COMPLETED", prefix)
                 elif not self.running:
-                    logger.info(f"⏸️  Processing stopped for {prefix} at {final_config.last_number} (automation stopped)")
+                    logger.info("⏸️  Processing stopped for %s at %s (automation stopped)", prefix, final_config.last_number)
                 else:
-                    logger.info(f"📝 Prefix {prefix} processing paused at {final_config.last_number} (will continue in next iteration)")
+                    logger.info("📝 Prefix %s processing paused at %s (will continue in next iteration)", prefix, final_config.last_number)
             else:
-                logger.warning(f"⚠️  Could not get final status for {prefix}")
+                logger.warning("⚠️  Could not get final status for %s", prefix)
             
         except Exception as e:
-            logger.error(f"Fatal error processing {prefix}: {e}")
+            logger.error("Fatal error processing %s: %s", prefix, e)
             # Keep as PENDING so it can be retried later
-            logger.warning(f"Keeping {prefix} as PENDING for retry after error")
+            logger.warning("Keeping %s as PENDING for retry after error", prefix)
+        finally:
+            # Don't leave this prefix's rows behind when it completes, pauses or stops
+            await self._flush_sheets()
     
-    async def _generate_and_process_single_id(self, prefix: str) -> bool:
-        """Generate and process a single ID - returns True if successful"""
+    async def _resync_last_number(self, prefix: str, current_number: int) -> int:
+        """Re-read last_number after a failure (it may have moved); keep current_number if that fails too"""
+        try:
+            prefix_config = await asyncio.to_thread(self.id_generator.get_prefix_status, prefix)
+        except Exception as e:
+            logger.warning("Could not re-read %s after error: %s", prefix, e)
+            return current_number
+        return prefix_config.last_number if prefix_config else current_number
+    
+    async def _generate_and_process_single_id(self, prefix: str) -> Optional[int]:
+        """Generate and process a single ID - returns its serial number, or None on failure"""
         
         try:
             # Generate ID
-            logger.info(f"Generating next ID for prefix: {prefix}")
-            id_result = self.id_generator.generate_next_id(prefix)
-            self.stats["total_generated"] += 1
+            logger.info("Generating next ID for prefix: %s", prefix)
+            id_result = await asyncio.to_thread(self.id_generator.generate_next_id, prefix)
+            self.stats.total_generated += 1
             
-            logger.info(f"Generated: {id_result.generated_id}")
+            logger.info("Generated: %s", id_result.generated_id)
             
             # Scrape mobile number
-            logger.info(f"Scraping mobile number for: {id_result.generated_id}")
-            scrape_result = self.scraper.scrape_mobile_number(id_result.generated_id)
+            logger.info("Scraping mobile number for: %s", id_result.generated_id)
+            scrape_result = await self._scrape(id_result.generated_id)
             
             mobile_number = scrape_result.mobile_number if scrape_result.success else None
             
             if mobile_number:
-                logger.info(f"Found mobile number: {mobile_number}")
-                self.stats["mobile_numbers_found"] += 1
+                logger.info("Found mobile number: %s", mobile_number)
+                self.stats.mobile_numbers_found += 1
                 
-                # Log to Google Sheets only if mobile number found
-                try:
-                    if mobile_number and mobile_number.strip():
-                        sheet_range = self.sheets.log_result(
-                            prefix=prefix,
-                            serial_number=id_result.serial_number,
-                            generated_id=id_result.generated_id,
-                            mobile_number=mobile_number
-                        )
-                        logger.info(f"Logged to sheets: {sheet_range}")
-                    else:
-                        logger.info(f"Skipping sheets logging for {id_result.generated_id} - no mobile number")
-                    
-                except Exception as e:
-                    logger.warning(f"Sheets logging failed for {id_result.generated_id}: {e}")
+                # Log to Google Sheets only if mobile number found (buffered, appended in batches)
+                if mobile_number.strip():
+                    await self._queue_sheet_rows(
+                        prefix, [(id_result.serial_number, id_result.generated_id, mobile_number)]
+                    )
+                else:
+                    logger.info("Skipping sheets logging for %s - no mobile number", id_result.generated_id)
             else:
-                logger.info(f"No mobile number found for: {id_result.generated_id}")
-            
-            # Update last_extracted in database
-            await self._update_last_extracted(prefix, id_result.serial_number)
+                logger.info("No mobile number found for: %s", id_result.generated_id)
             
-            return True
+            # last_number was already persisted by the atomic claim in the ID generator
+            return id_result.serial_number
             
         except Exception as e:
-            logger.error(f"❌ Error generating/processing ID for {prefix}: {e}")
-            self.stats["errors"] += 1
-            return False
+            logger.error("❌ Error generating/processing ID for %s: %s", prefix, e)
+            self.stats.errors += 1
+            return None
+        finally:
+            self._publish_stats()
     
-    async def _update_last_extracted(self, prefix: str, serial_number: int):
-        """Update the last_extracted field for the prefix"""
+    async def _generate_and_process_batch(self, prefix: str, count: int) -> Optional[int]:
+        """Generate and process `count` consecutive IDs - returns the last serial number, or None on failure
+        
+        The IDs are claimed with one database update, up to
+        settings.scrape_concurrency of them are scraped at once, and the
+        mobile numbers found are buffered for Google Sheets.
+        """
         
         try:
-            self.client.table("prefix_metadata").update({
-                "last_number": serial_number  # This is already updated by ID generator
-            }).eq("prefix", prefix).execute()
+            # Generate IDs
+            logger.info("Generating next %s IDs for prefix: %s", count, prefix)
+            id_results = await asyncio.to_thread(self.id_generator.generate_next_ids, prefix, count)
+            self.stats.total_generated += len(id_results)
             
-            logger.debug(f"📝 Updated last_extracted for {prefix}: {serial_number}")
+            # Scrape mobile numbers - overlap the HTTP round-trips, results stay in ID order
+            semaphore = asyncio.Semaphore(self.settings.scrape_concurrency)
+            scrape_results = await asyncio.gather(
+                *(self._scrape_bounded(semaphore, id_result.generated_id) for id_result in id_results)
+            )
+            
+            found_rows = []
+            for id_result, scrape_result in zip(id_results, scrape_results):
+                mobile_number = scrape_result.mobile_number if scrape_result.success else None
+                
+                if mobile_number:
+                    logger.info("Found mobile number: %s", mobile_number)
+                    self.stats.mobile_numbers_found += 1
+                    found_rows.append((id_result.serial_number, id_result.generated_id, mobile_number))
+                else:
+                    logger.info("No mobile number found for: %s", id_result.generated_id)
+            
+            # Log to Google Sheets only the IDs with a mobile number (buffered, appended in batches)
+            if found_rows:
+                await self._queue_sheet_rows(prefix, found_rows)
+            
+            # last_number was already persisted by the atomic claim in the ID generator
+            return id_results[-1].serial_number
             
         except Exception as e:
-            logger.error(f"❌ Error updating last_extracted for {prefix}: {e}")
+            logger.error("❌ Error generating/processing batch for %s: %s", prefix, e)
+            self.stats.errors += 1
+            return None
+        finally:
+            self._publish_stats()
+    
+    async def _scrape(self, generated_id: str):
+        """Scrape one ID on the scraper thread pool, off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._scrape_executor, self.scraper.scrape_mobile_number, generated_id)
+    
+    async def _scrape_bounded(self, semaphore: asyncio.Semaphore, generated_id: str):
+        """Scrape one ID, at most semaphore's limit at a time"""
+        async with semaphore:
+            logger.info("Scraping mobile number for: %s", generated_id)
+            return await self._scrape(generated_id)
+    
+    async def _queue_sheet_rows(self, prefix: str, rows: List[Tuple[int, str, str]]):
+        """Buffer found rows for Google Sheets, flushing when the batch is full or stale"""
+        
+        if self._sheets_buffer_prefix != prefix:
+            await self._flush_sheets()  # one worksheet per prefix - never mix them in an append
+            self._sheets_buffer_prefix = prefix
+        
+        self._sheets_buffer.extend(rows)
+        if len(self._sheets_buffer) >= self.settings.sheets_batch_size:
+            self._start_sheets_append()  # runs while the loop moves on to the next scrape
+        elif self._sheets_flush_timer is None:
+            # Found rows are rare, so don't wait for a full batch: last_number is already
+            # saved, and rows still buffered at a crash would never be scraped again
+            self._sheets_flush_timer = asyncio.get_running_loop().call_later(
+                SHEETS_FLUSH_INTERVAL, self._start_sheets_append
+            )
+    
+    def _start_sheets_append(self):
+        """Hand the buffered rows to a background append task"""
+        
+        if self._sheets_flush_timer is not None:
+            self._sheets_flush_timer.cancel()
+            self._sheets_flush_timer = None
+        if not self._sheets_buffer:
+            return
+        
+        prefix, rows = self._sheets_buffer_prefix, self._sheets_buffer
+        self._sheets_buffer = []
+        self._sheets_append_task = asyncio.create_task(
+            self._append_sheet_rows(prefix, rows, self._sheets_append_task),
+            name="sheets-append"
+        )
+    
+    async def _flush_sheets(self):
+        """Append everything still buffered and wait for all in-flight appends"""
+        
+        self._start_sheets_append()
+        task, self._sheets_append_task = self._sheets_append_task, None
+        if task is not None:
+            await task
+    
+    async def _append_sheet_rows(
+        self,
+        prefix: str,
+        rows: List[Tuple[int, str, str]],
+        previous: Optional[asyncio.Task]
+    ):
+        """Append rows to the prefix's worksheet in a single API call, after the previous append"""
+        
+        if previous is not None:
+            await previous
+        try:
+            sheet_range = await asyncio.to_thread(self.sheets.log_results_bulk, prefix, rows)
+            logger.info("Logged %s rows to sheets: %s", len(rows), sheet_range)
+        except Exception as e:
+            logger.warning("Sheets logging failed for %s rows of %s: %s", len(rows), prefix, e)
     
     async def _mark_prefix_status(self, prefix: str, status: PrefixStatus):
         """Mark prefix with specific status"""
@@ -310,38 +523,57 @@ class SequentialAutomationService:
                 "status": status.value
             }
             
-            self.client.table("prefix_metadata").update(update_data).eq("prefix", prefix).execute()
+            await asyncio.to_thread(
+                self.client.table("prefix_metadata").update(update_data).eq("prefix", prefix).execute
+            )
             
-            logger.info(f"📝 Marked {prefix} as {status.value}")
+            logger.info("📝 Marked %s as %s", prefix, status.value)
             
         except Exception as e:
-            logger.error(f"❌ Error marking {prefix} status: {e}")
+            logger.error("❌ Error marking %s status: %s", prefix, e)
     
     def stop(self):
         """Stop the automation service"""
         logger.info("🛑 Stopping sequential automation...")
         self.running = False
+        self.wake()  # don't sit out an idle wait before the loop notices
         
-        # Keep current prefix as PENDING if interrupted
+        # An interrupted prefix needs no write: it stays PENDING until the loop
+        # marks it COMPLETED, so the next run resumes it from last_number
         if self.current_prefix:
-            try:
-                self.client.table("prefix_metadata").update({
-                    "status": PrefixStatus.PENDING.value
-                }).eq("prefix", self.current_prefix).execute()
-                
-                logger.info(f"Marked {self.current_prefix} as PENDING (was interrupted)")
-            except Exception as e:
-                logger.error(f"Error marking {self.current_prefix} as PENDING: {e}")
+            logger.info("%s left PENDING (was interrupted)", self.current_prefix)
     
-    def get_stats(self) -> Dict:
-        """Get current automation statistics"""
-        stats = self.stats.copy()
+    def _publish_stats(self):
+        """Rebuild the stats snapshot read by get_stats"""
+        stats = self.stats.as_dict()
         
         if stats["start_time"]:
-            runtime = datetime.now(timezone.utc) - stats["start_time"]
-            stats["runtime_seconds"] = runtime.total_seconds()
+            stats["runtime_seconds"] = time.monotonic() - self._start_monotonic
             stats["success_rate"] = (
                 (stats["total_generated"] - stats["errors"]) / max(stats["total_generated"], 1) * 100
             )
         
-        return stats
+        self._stats_snapshot = stats
+    
+    def get_stats(self) -> Dict:
+        """Get the latest automation statistics snapshot (lock-free, O(1))
+        
+        The snapshot is refreshed by the automation loop after every ID and
+        prefix change, so runtime_seconds is as of the last loop update.
+        """
+        return self._stats_snapshot
+
+
+@lru_cache(maxsize=1)
+def get_automation_service() -> SequentialAutomationService:
+    """Get the process-wide automation service"""
+    return SequentialAutomationService()
+
+
+def wake_running_automation():
+    """Wake the automation loop if it is running - never builds the service just to wake it"""
+    if not get_automation_service.cache_info().currsize:
+        return
+    automation_service = get_automation_service()
+    if automation_service.running:
+        automation_service.wake()
@@ -2,35 +2,50 @@
 
 import asyncio
 import logging
-from datetime import datetime, timezone
 from typing import Optional
 
+from app.core.config import get_settings
 from app.core.database import get_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Channel the sql/prefix_change_notify.sql trigger publishes on ("<prefix>:<status>")
+NOTIFY_CHANNEL = "prefix_changes"
+# With LISTEN/NOTIFY, still re-check this many check_intervals apart (catches missed notifications)
+NOTIFY_SAFETY_FACTOR = 10
+
 
 class DatabaseChangeMonitor:
     """Monitor Supabase for changes and trigger automation restart"""
     
-    def __init__(self, automation_service, check_interval: int = 30):
+    def __init__(
+        self,
+        automation_service,
+        check_interval: int = 30,
+        changes_event: Optional[asyncio.Event] = None
+    ):
         """
         Initialize change monitor
         
         Args:
             automation_service: The automation service to restart
             check_interval: How often to check for changes (seconds)
+            changes_event: If given, set this event on changes instead of
+                restarting automation here (the owner of the event restarts it)
         """
         self.client = get_supabase_client()
+        self.database_url = get_settings().database_url
         self.automation_service = automation_service
         self.check_interval = check_interval
+        self.changes_event = changes_event
         self.running = False
         self.last_pending_count = None  # None means not initialized yet
+        # Set by LISTEN/NOTIFY callbacks; the monitor loop re-checks when it fires
+        self._notified = asyncio.Event()
         
     async def start_monitoring(self):
         """Start monitoring database for changes"""
         self.running = True
-        logger.info(f"🔍 Starting database change monitor (checking every {self.check_interval}s)")
         
         # Wait a bit before first check to ensure automation has time to start
         await asyncio.sleep(5)
@@ -40,6 +55,15 @@ class DatabaseChangeMonitor:
         self.last_pending_count = initial_state.get("pending_count", 0)
         logger.info(f"📊 Initial state: {self.last_pending_count} PENDING prefixes (monitoring for changes)")
         
+        if self.database_url:
+            await self._monitor_with_notify()
+        if self.running:
+            await self._monitor_with_polling()
+    
+    async def _monitor_with_polling(self):
+        """Query prefix_metadata every check_interval seconds"""
+        logger.info(f"🔍 Starting database change monitor (checking every {self.check_interval}s)")
+        
         while self.running:
             try:
                 await asyncio.sleep(self.check_interval)
@@ -47,30 +71,82 @@ class DatabaseChangeMonitor:
                 if not self.running:
                     break
                 
-                # Check for changes
-                current_state = await self._get_current_state()
-                
-                # Detect changes
-                if self._detect_changes(current_state):
-                    logger.info("🔄 Database changes detected - restarting automation...")
-                    await self._restart_automation()
+                await self._check_for_changes()
                     
             except Exception as e:
-                logger.error(f"❌ Error in change monitor: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
+                logger.exception(f"❌ Error in change monitor: {e}")
                 # Continue monitoring even if there's an error
                 await asyncio.sleep(self.check_interval)
     
+    async def _monitor_with_notify(self):
+        """Re-check only when Postgres pushes a prefix_metadata status change
+        
+        Needs the sql/prefix_change_notify.sql trigger and a session-mode
+        connection (LISTEN doesn't work through a transaction pooler). Returns
+        if the connection can't be opened, so the caller falls back to polling.
+        """
+        try:
+            import asyncpg
+            connection = await asyncpg.connect(self.database_url)
+            await connection.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        except Exception as e:
+            logger.warning(f"⚠️  LISTEN/NOTIFY unavailable ({e}) - falling back to polling")
+            return
+        
+        safety_interval = self.check_interval * NOTIFY_SAFETY_FACTOR
+        logger.info(f"🔍 Starting database change monitor (LISTEN {NOTIFY_CHANNEL}, re-checking every {safety_interval}s)")
+        try:
+            while self.running and not connection.is_closed():
+                try:
+                    await asyncio.wait_for(self._notified.wait(), safety_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._notified.clear()
+                
+                if not self.running:
+                    break
+                
+                try:
+                    await self._check_for_changes()
+                except Exception as e:
+                    logger.exception(f"❌ Error in change monitor: {e}")
+            
+            if self.running:
+                logger.warning("⚠️  LISTEN connection closed - falling back to polling")
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+    
+    def _on_notify(self, connection, pid, channel, payload):
+        """asyncpg listener callback - runs on the event loop"""
+        logger.debug(f"📨 {channel}: {payload}")
+        self._notified.set()
+        # A running loop finds new work itself - just cut its idle wait short
+        if self.automation_service.running:
+            self.automation_service.wake()
+    
+    async def _check_for_changes(self):
+        """Query the current state once and hand any changes to automation"""
+        current_state = await self._get_current_state()
+        
+        if self._detect_changes(current_state):
+            if self.changes_event is not None:
+                logger.info("🔄 Database changes detected - signalling automation...")
+                self.changes_event.set()
+            else:
+                logger.info("🔄 Database changes detected - restarting automation...")
+                await self._restart_automation()
+    
     async def _get_current_state(self) -> dict:
         """Get current state of prefix_metadata table - simple check for PENDING"""
         try:
-            # Get only PENDING prefixes
-            result = self.client.table("prefix_metadata").select("prefix,status").eq("status", "pending").execute()
-            pending_prefixes = result.data or []
+            # Let Postgres count PENDING prefixes - only the count comes back, not the rows
+            result = await asyncio.to_thread(
+                self.client.table("prefix_metadata").select("prefix", count="exact").eq("status", "pending").limit(1).execute
+            )
             
             state = {
-                "pending_count": len(pending_prefixes)
+                "pending_count": result.count or 0
             }
             
             return state
@@ -141,12 +217,11 @@ class DatabaseChangeMonitor:
                 logger.info("ℹ️  No prefixes to automate after restart")
                 
         except Exception as e:
-            logger.error(f"❌ Error restarting automation: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Error restarting automation: {e}")
     
     def stop(self):
         """Stop monitoring"""
         logger.info("🛑 Stopping database change monitor...")
         self.running = False
+        self._notified.set()  # end a LISTEN wait now
 
@@ -2,7 +2,8 @@
 
 import logging
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -10,14 +11,25 @@ from app.core.database import get_supabase_client
 from app.models.schemas import PrefixConfig, IDGenerationResult
 from app.models.enums import PrefixStatus
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _id_formatter(prefix: str, digits: int, has_space: bool):
+    """Bound str.format for one prefix's ID layout, built once per (prefix, digits, has_space)"""
+    separator = " " if has_space else ""
+    literal = prefix.replace("{", "{{").replace("}", "}}")  # prefix is text, not format syntax
+    return f"{literal}{separator}{{:0{digits}d}}".format
+
+
 class IDGeneratorService:
     """Service for generating sequential IDs with Supabase backend"""
     
-    def __init__(self):
-        self.client = get_supabase_client()
+    def __init__(self, client: Optional["Client"] = None):
+        self.client = client or get_supabase_client()
         self.table_name = "prefix_metadata"
         self.log_table = "serial_log"
     
@@ -56,6 +68,44 @@ class IDGeneratorService:
         logger.info(f"Generated ID: {formatted_id}")
         return result
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10)
+    )
+    def generate_next_ids(
+        self,
+        prefix: str,
+        count: int,
+        digits: Optional[int] = None,
+        has_space: Optional[bool] = None
+    ) -> List[IDGenerationResult]:
+        """Generate the next `count` sequential IDs for a prefix with one atomic update"""
+        
+        prefix = prefix.strip().upper()
+        count = max(count, 1)
+        logger.info(f"Generating next {count} IDs for prefix: {prefix}")
+        
+        try:
+            # Claim the whole range in one round-trip
+            config = self._claim_via_rpc(prefix, count, digits, has_space)
+        except Exception as e:
+            logger.warning(f"RPC batch claim failed, using fallback: {e}")
+            config = self._increment_via_update(prefix, digits, has_space, count)
+        
+        first_number = config.last_number - count + 1
+        results = []
+        for serial_number in range(first_number, config.last_number + 1):
+            formatted_id = self._format_number(config, serial_number)
+            results.append(IDGenerationResult(
+                prefix_config=config,
+                generated_id=formatted_id,
+                serial_number=serial_number,
+                formatted_id=formatted_id
+            ))
+        
+        logger.info(f"Generated IDs: {results[0].generated_id} .. {results[-1].generated_id}")
+        return results
+    
     def _increment_via_rpc(
         self, 
         prefix: str, 
@@ -86,11 +136,39 @@ class IDGeneratorService:
         
         return PrefixConfig(**data)
     
+    def _claim_via_rpc(
+        self,
+        prefix: str,
+        count: int,
+        digits: Optional[int],
+        has_space: Optional[bool]
+    ) -> PrefixConfig:
+        """Use Supabase RPC function to claim `count` numbers atomically"""
+        
+        payload = {
+            "p_prefix": prefix,
+            "p_count": count,
+            "p_digits": digits,
+            "p_has_space": has_space
+        }
+        
+        result = self.client.rpc("claim_prefix_numbers", payload).execute()
+        
+        if not result.data:
+            raise ValueError(f"RPC returned no data for prefix: {prefix}")
+        
+        data = result.data
+        if isinstance(data, list):
+            data = data[0]
+        
+        return PrefixConfig(**data)
+    
     def _increment_via_update(
         self, 
         prefix: str, 
         digits: Optional[int], 
-        has_space: Optional[bool]
+        has_space: Optional[bool],
+        count: int = 1
     ) -> PrefixConfig:
         """Fallback method using direct table operations"""
         
@@ -100,7 +178,7 @@ class IDGeneratorService:
         if existing.data:
             # Update existing
             current = existing.data[0]
-            new_number = current["last_number"] + 1
+            new_number = current["last_number"] + count
             
             updated = self.client.table(self.table_name).update({
                 "last_number": new_number,
@@ -115,7 +193,7 @@ class IDGeneratorService:
             new_config = {
                 "prefix": prefix,
                 "digits": digits or 5,
-                "last_number": 1,
+                "last_number": count,
                 "has_space": has_space if has_space is not None else True,
                 "status": PrefixStatus.NOT_STARTED.value
             }
@@ -125,9 +203,11 @@ class IDGeneratorService:
     
     def _format_id(self, config: PrefixConfig) -> str:
         """Format the ID according to configuration"""
-        padded_number = str(config.last_number).zfill(config.digits)
-        separator = " " if config.has_space else ""
-        return f"{config.prefix}{separator}{padded_number}"
+        return self._format_number(config, config.last_number)
+    
+    def _format_number(self, config: PrefixConfig, number: int) -> str:
+        """Format a serial number with the prefix's digits/spacing"""
+        return _id_formatter(config.prefix, config.digits, config.has_space)(number)
     
     def get_prefix_status(self, prefix: str) -> Optional[PrefixConfig]:
         """Get current status of a prefix"""
@@ -166,13 +246,37 @@ class IDGeneratorService:
     ) -> str:
         """Log a serial generation event"""
         
-        log_entry = {
+        log_entry = self._serial_log_entry(prefix, generated_id, mobile_number, status, metadata)
+        
+        result = self.client.table(self.log_table).insert(log_entry).execute()
+        return result.data[0]["id"]
+    
+    def log_serial_events_bulk(self, events: List[dict]) -> int:
+        """Log several serial generation events with a single insert
+        
+        Each event takes the same keyword arguments as log_serial_event.
+        """
+        if not events:
+            return 0
+        
+        log_entries = [self._serial_log_entry(**event) for event in events]
+        
+        result = self.client.table(self.log_table).insert(log_entries).execute()
+        return len(result.data or [])
+    
+    @staticmethod
+    def _serial_log_entry(
+        prefix: str,
+        generated_id: str,
+        mobile_number: Optional[str],
+        status: str,
+        metadata: Optional[dict] = None
+    ) -> dict:
+        """Build a serial_log row"""
+        return {
             "prefix": prefix.strip().upper(),
             "generated_id": generated_id,
             "mobile": mobile_number,
             "status": status,
             "extra": metadata or {}
-        }
-        
-        result = self.client.table(self.log_table).insert(log_entry).execute()
-        return result.data[0]["id"]
\ No newline at end of file
+        }
\ No newline at end of file
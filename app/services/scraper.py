@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+import threading
 import time
 from typing import Optional
 
@@ -14,6 +15,11 @@ from app.models.schemas import ScrapeResult
 
 logger = logging.getLogger(__name__)
 
+# requests.Session is not thread-safe, so keep one per thread. It lives at module
+# level so all scraper instances (routes, automation, health checks) reuse the same
+# pooled keep-alive connections instead of each paying DNS + TCP + TLS setup.
+_sessions = threading.local()
+
 
 class SPDCLScraperService:
     """Service for scraping SPDCL website"""
@@ -23,16 +29,23 @@ class SPDCLScraperService:
         self.base_url = "https://tgsouthernpower.org"
         self.form_url = f"{self.base_url}/knowyourusn"
         self.data_url = f"{self.base_url}/getUkscno"
-        
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1"
-        })
+    
+    @property
+    def session(self) -> requests.Session:
+        """Per-thread HTTP session with keep-alive, shared by every scraper instance"""
+        session = getattr(_sessions, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.5",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+                "Upgrade-Insecure-Requests": "1"
+            })
+            _sessions.session = session
+        return session
     
     @retry(
         stop=stop_after_attempt(3),
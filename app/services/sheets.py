@@ -1,9 +1,9 @@
 """Google Sheets service with robust error handling"""
 
+import json
 import logging
-import os
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
 import gspread
 from gspread.exceptions import WorksheetNotFound, SpreadsheetNotFound
@@ -27,36 +27,25 @@ class GoogleSheetsService:
         """Lazy-loaded Google Sheets client"""
         if self._client is None:
             try:
-                # Check environment variable first (for Render/Railway)
-                json_from_env = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
-                json_from_settings = self.settings.google_service_account_json
-                
                 # Support Railway/env var JSON (preferred) or file path
-                if json_from_env or json_from_settings:
-                    import json
-                    service_account_json = json_from_env or json_from_settings
-                    try:
-                        service_account_info = json.loads(service_account_json)
-                        self._client = gspread.service_account_from_dict(service_account_info)
-                        logger.info("Google Sheets client initialized from JSON env var")
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON in GOOGLE_SERVICE_ACCOUNT_JSON: {e}")
-                        logger.error(f"JSON length: {len(service_account_json) if service_account_json else 0} characters")
-                        raise ValueError(f"Invalid JSON format in GOOGLE_SERVICE_ACCOUNT_JSON: {e}")
-                elif self.settings.google_service_account_file:
-                    from pathlib import Path
-                    file_path = Path(self.settings.google_service_account_file)
-                    if file_path.exists():
-                        self._client = gspread.service_account(
-                            filename=str(file_path)
-                        )
-                        logger.info("Google Sheets client initialized from file")
-                    else:
-                        raise ValueError(f"Service account file not found: {file_path}")
-                else:
+                # Credentials are resolved (parsed/read) once per process by Settings
+                try:
+                    service_account_info = self.settings.service_account_info
+                except json.JSONDecodeError as e:
+                    logger.error(f"Invalid service account JSON: {e}")
+                    raise ValueError(f"Invalid JSON format in service account credentials: {e}")
+                except FileNotFoundError:
+                    raise ValueError(
+                        f"Service account file not found: {self.settings.google_service_account_file}"
+                    )
+                
+                if service_account_info is None:
                     raise ValueError(
                         "Either GOOGLE_SERVICE_ACCOUNT_JSON env var or google_service_account_file must be provided"
                     )
+                
+                self._client = gspread.service_account_from_dict(service_account_info)
+                logger.info("Google Sheets client initialized from service account credentials")
             except Exception as e:
                 logger.error(f"Failed to initialize Google Sheets client: {e}")
                 raise
@@ -131,9 +120,49 @@ class GoogleSheetsService:
             return range_notation
             
         except Exception as e:
-            logger.error(f"❌ Failed to log to Google Sheets: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"❌ Failed to log to Google Sheets: {e}")
+            raise
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10)
+    )
+    def log_results_bulk(
+        self,
+        prefix: str,
+        rows: Sequence[Tuple[int, str, Optional[str]]],
+        sheet_id: Optional[str] = None
+    ) -> Optional[str]:
+        """Append several (serial_number, generated_id, mobile_number) rows in one API call
+        
+        Rows without a mobile number are skipped, as in log_result.
+        Returns the updated range, or None if there was nothing to log.
+        """
+        
+        row_data: List[list] = [
+            [serial_number, generated_id, mobile_number]
+            for serial_number, generated_id, mobile_number in rows
+            if mobile_number and mobile_number.strip() and mobile_number != "N/A"
+        ]
+        if not row_data:
+            return None
+        
+        logger.info(f"📊 Logging {len(row_data)} results for {prefix} to Google Sheets")
+        
+        try:
+            spreadsheet = self.client.open_by_key(sheet_id) if sheet_id else self.spreadsheet
+            worksheet = self._get_or_create_worksheet(spreadsheet, prefix)
+            
+            response = worksheet.append_rows(row_data, value_input_option="USER_ENTERED")
+            
+            # The append response already carries the written range - no re-read needed
+            range_notation = (response or {}).get("updates", {}).get("updatedRange", prefix)
+            
+            logger.info(f"✅ Successfully logged to Google Sheets range: {range_notation}")
+            return range_notation
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to log batch to Google Sheets: {e}")
             raise
     
     def _get_or_create_worksheet(self, spreadsheet, prefix: str):
@@ -1,5 +1,6 @@
 """Startup service to check and resume existing automation tasks"""
 
+import asyncio
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
@@ -7,7 +8,7 @@ from datetime import datetime, timezone
 from app.core.database import get_supabase_client
 from app.models.enums import PrefixStatus
 from app.models.schemas import PrefixConfig
-from app.services.automation_new import SequentialAutomationService
+from app.services.automation_new import get_automation_service
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,7 @@ class StartupService:
     
     def __init__(self):
         self.client = get_supabase_client()
-        self.automation_service = SequentialAutomationService()
+        self.automation_service = get_automation_service()
         self.automation_task = None  # Store task reference
     
     async def check_and_resume_automation(self) -> Dict:
@@ -26,7 +27,7 @@ class StartupService:
         logger.info("Checking Supabase for existing automation tasks...")
         
         # Get all prefixes from database
-        all_prefixes = self._get_all_prefixes()
+        all_prefixes = await asyncio.to_thread(self._get_all_prefixes)
         
         # Categorize prefixes by status (only 3 statuses: NOT_STARTED, PENDING, COMPLETED)
         not_started_prefixes = []
@@ -41,9 +42,11 @@ class StartupService:
                 # Update in database directly
                 from app.core.database import get_supabase_client
                 client = get_supabase_client()
-                client.table("prefix_metadata").update({
-                    "status": PrefixStatus.PENDING.value
-                }).eq("prefix", prefix_data.get("prefix")).execute()
+                await asyncio.to_thread(
+                    client.table("prefix_metadata").update({
+                        "status": PrefixStatus.PENDING.value
+                    }).eq("prefix", prefix_data.get("prefix")).execute
+                )
                 # Update in memory for processing
                 prefix_data["status"] = "pending"
             
@@ -105,7 +108,9 @@ class StartupService:
             
             if all_prefix_names:
                 logger.info(f"📊 Ensuring Google Sheets worksheets exist for {len(all_prefix_names)} prefixes...")
-                sheet_results = sheets_service.create_worksheets_for_all_prefixes(all_prefix_names)
+                sheet_results = await asyncio.to_thread(
+                    sheets_service.create_worksheets_for_all_prefixes, all_prefix_names
+                )
                 logger.info(f"✅ Sheets check complete: {len(sheet_results['created'])} created, {len(sheet_results['existing'])} existing")
         except Exception as e:
             logger.warning(f"⚠️  Could not create/verify Google Sheets worksheets: {e}")
@@ -118,9 +123,8 @@ class StartupService:
             
             # Start sequential automation (will automatically pick up prefixes from database)
             # It will process PENDING first, then NOT_STARTED
-            # Only start if not already running
-            if not self.automation_service.running:
-                import asyncio
+            # Only start if not already running (reserved now - the task starts later)
+            if self.automation_service.reserve_start():
                 task = asyncio.create_task(
                     self.automation_service.start_sequential_processing(
                         generation_interval=5  # 5 seconds between generations
@@ -36,9 +36,14 @@ try:
     print(f"   ✅ uvicorn is installed: {uvicorn.__version__}")
 except ImportError:
     print(f"   ❌ uvicorn is NOT installed")
+try:
+    import uvloop
+    print(f"   ✅ uvloop is installed: {uvloop.__version__}")
+except ImportError:
+    print(f"   ❌ uvloop is NOT installed (needed for --loop uvloop; comes with uvicorn[standard])")
 
 print(f"\n6. Command that should be running:")
-print(f"   uvicorn app.main:app --host 0.0.0.0 --port $PORT --log-level info")
+print(f"   uvicorn app.main:app --host 0.0.0.0 --port $PORT --loop uvloop --log-level info")
 
 print("\n" + "=" * 60)
 print("If PORT is not set, Render may not be running this as a web service")
@@ -0,0 +1,25 @@
+-- Add a priority column so automation picks high-priority prefixes first
+-- Used by SequentialAutomationService (ORDER BY priority DESC, prefix) and claim_next_prefix
+-- Run this in Supabase SQL Editor (before re-running sql/claim_next_prefix.sql)
+
+ALTER TABLE public.prefix_metadata
+ADD COLUMN IF NOT EXISTS priority integer NOT NULL DEFAULT 0;
+
+-- Matches the next-prefix lookup (status filter + priority order), so Postgres
+-- reads the first index entry instead of sorting the table
+CREATE INDEX IF NOT EXISTS prefix_metadata_status_priority_idx
+ON public.prefix_metadata (status, priority DESC, prefix);
+
+-- Raise a prefix's priority with e.g.:
+-- UPDATE public.prefix_metadata SET priority = 10 WHERE prefix = 'ABC';
+
+-- Verify the column and index exist
+SELECT column_name, column_default, data_type
+FROM information_schema.columns
+WHERE table_name = 'prefix_metadata'
+AND column_name = 'priority';
+
+SELECT indexname, indexdef
+FROM pg_indexes
+WHERE tablename = 'prefix_metadata'
+AND indexname = 'prefix_metadata_status_priority_idx';
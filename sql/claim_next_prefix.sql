@@ -0,0 +1,30 @@
+-- Promote one NOT_STARTED prefix to PENDING and return it, in one round-trip
+-- Used by SequentialAutomationService when no PENDING prefix is left
+-- Requires the priority column from sql/add_prefix_priority.sql
+-- Run this in Supabase SQL Editor
+
+DROP FUNCTION IF EXISTS public.claim_next_prefix();
+
+CREATE OR REPLACE FUNCTION public.claim_next_prefix()
+RETURNS TABLE (
+    prefix text
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- SKIP LOCKED: concurrent callers each get a different row (or none),
+    -- never the same prefix twice
+    RETURN QUERY
+    UPDATE public.prefix_metadata pm
+    SET status = 'pending'
+    WHERE pm.prefix = (
+        SELECT candidate.prefix
+        FROM public.prefix_metadata candidate
+        WHERE candidate.status = 'not_started'
+        ORDER BY candidate.priority DESC, candidate.prefix
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING pm.prefix::text;
+END;
+$$;
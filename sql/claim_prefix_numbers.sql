@@ -0,0 +1,39 @@
+-- Claim a block of consecutive serial numbers for a prefix in one round-trip
+-- Used by IDGeneratorService.generate_next_ids for batched automation
+-- Run this in Supabase SQL Editor
+
+DROP FUNCTION IF EXISTS public.claim_prefix_numbers(text, integer, integer, boolean);
+
+CREATE OR REPLACE FUNCTION public.claim_prefix_numbers(
+    p_prefix text,
+    p_count integer DEFAULT 1,
+    p_digits integer DEFAULT NULL,
+    p_has_space boolean DEFAULT NULL
+)
+RETURNS TABLE (
+    prefix text,
+    digits integer,
+    last_number integer,
+    has_space boolean,
+    status text
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_count IS NULL OR p_count < 1 THEN
+        RAISE EXCEPTION 'p_count must be at least 1';
+    END IF;
+
+    -- Single atomic UPDATE: the row lock serializes concurrent claims, so
+    -- every caller gets a disjoint range (last_number - p_count + 1 .. last_number)
+    RETURN QUERY
+    UPDATE public.prefix_metadata pm
+    SET
+        last_number = pm.last_number + p_count,
+        digits = COALESCE(p_digits, pm.digits),
+        has_space = COALESCE(p_has_space, pm.has_space),
+        status = 'pending'  -- Always use 'pending', never 'running'
+    WHERE pm.prefix = p_prefix
+    RETURNING pm.prefix, pm.digits, pm.last_number, pm.has_space, pm.status::text;
+END;
+$$;
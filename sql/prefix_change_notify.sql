@@ -0,0 +1,26 @@
+-- Push prefix_metadata status changes to the app via LISTEN/NOTIFY
+-- Used by DatabaseChangeMonitor when DATABASE_URL is set (no polling needed)
+-- Run this in Supabase SQL Editor
+
+CREATE OR REPLACE FUNCTION public.notify_prefix_change()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- claim_prefix_numbers re-sets status = 'pending' on every claim, so only
+    -- notify on real transitions (and new rows), not on every generated ID
+    IF TG_OP = 'INSERT' OR NEW.status IS DISTINCT FROM OLD.status THEN
+        PERFORM pg_notify('prefix_changes', NEW.prefix || ':' || NEW.status::text);
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS prefix_metadata_notify ON public.prefix_metadata;
+
+CREATE TRIGGER prefix_metadata_notify
+AFTER INSERT OR UPDATE OF status ON public.prefix_metadata
+FOR EACH ROW
+EXECUTE FUNCTION public.notify_prefix_change();
+
+-- Verify: in one session run LISTEN prefix_changes; then update a row's status
@@ -6,5 +6,5 @@ echo "📡 Binding to port: $PORT"
 echo "🌐 Health check will be available at: /"
 
 # Start uvicorn with explicit logging
-exec uvicorn app.main:app --host 0.0.0.0 --port $PORT --log-level info
+exec uvicorn app.main:app --host 0.0.0.0 --port $PORT --loop uvloop --log-level info
 